@@ -7,11 +7,63 @@ load_dotenv()
 # Database configuration - Use SQLite for easy local development
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./fitness_tracker.db")
 
+# Serve requests with AsyncSession (aiosqlite / asyncpg) instead of the threadpool
+DATABASE_ASYNC = os.getenv("DATABASE_ASYNC", "false").lower() in ("1", "true", "yes")
+
+# Read replicas (comma-separated URLs); read-only endpoints are routed to them
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+# A replica that fails its connection check is skipped for this long
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+# After a write, the user's reads stay on the primary for this long (0 disables)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# Delta sync: re-deliver changes this close to the watermark, so rows committed late are not missed
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "10"))
+# Delete tombstones are kept this long; older watermarks need a full resync
+TOMBSTONE_RETENTION_DAYS = int(os.getenv("TOMBSTONE_RETENTION_DAYS", "30"))
+
+# SQLite performance profile: WAL journal, relaxed fsync and larger caches
+SQLITE_PERFORMANCE = os.getenv("SQLITE_PERFORMANCE", "true").lower() in ("1", "true", "yes")
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+# Connections opened beyond the pool under load. A request may hold two sessions
+# (auth and export streams, event stream auth), so the pool plus overflow covers
+# the 40 threadpool workers and such requests queue instead of deadlocking
+SQLITE_MAX_OVERFLOW = int(os.getenv("SQLITE_MAX_OVERFLOW", "32"))
+
 # JWT configuration
 JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
 JWT_ALGORITHM = "HS256"
 JWT_EXPIRATION_HOURS = 24
 
+# Password hashing, stored hashes with another cost are upgraded on login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "16"))
+
+# Authenticated user cache
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "1024"))
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+
+# Verified JWT cache, entries never outlive the token's exp (size 0 disables)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+TOKEN_CACHE_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_TTL_SECONDS", "3600"))
+
+# Change event streams: per-subscriber queue length, keep-alive and client retry intervals
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "16"))
+EVENT_HEARTBEAT_SECONDS = float(os.getenv("EVENT_HEARTBEAT_SECONDS", "15"))
+EVENT_RETRY_MS = int(os.getenv("EVENT_RETRY_MS", "3000"))
+
+# Lifetime of the single-use tickets that authenticate EventSource connections
+EVENT_TICKET_SECONDS = int(os.getenv("EVENT_TICKET_SECONDS", "30"))
+
+# Redeemed tickets remembered until they expire. Nothing is evicted early,
+# so when this many were redeemed within EVENT_TICKET_SECONDS further
+# tickets are refused with 503 until the oldest expire
+EVENT_TICKET_CACHE_SIZE = int(os.getenv("EVENT_TICKET_CACHE_SIZE", "65536"))
+
 # API configuration
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
@@ -19,3 +71,16 @@ API_PORT = int(os.getenv("API_PORT", "8000"))
 # Dashboard configuration
 DASHBOARD_HOST = os.getenv("DASHBOARD_HOST", "0.0.0.0")
 DASHBOARD_PORT = int(os.getenv("DASHBOARD_PORT", "8050"))
+
+# Dashboard API client: keep-alive connections, timeouts, retries of idempotent calls, parallel fetches
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "16"))
+API_CONNECT_TIMEOUT_SECONDS = float(os.getenv("API_CONNECT_TIMEOUT_SECONDS", "3"))
+API_READ_TIMEOUT_SECONDS = float(os.getenv("API_READ_TIMEOUT_SECONDS", "30"))
+API_RETRIES = int(os.getenv("API_RETRIES", "2"))
+API_FETCH_WORKERS = int(os.getenv("API_FETCH_WORKERS", "8"))
+
+# Dashboard response cache: memory (per process), sqlite (file shared by workers) or none
+DASHBOARD_CACHE_BACKEND = os.getenv("DASHBOARD_CACHE_BACKEND", "memory").lower()
+DASHBOARD_CACHE_PATH = os.getenv("DASHBOARD_CACHE_PATH", "./dashboard_cache.db")
+DASHBOARD_CACHE_SIZE = int(os.getenv("DASHBOARD_CACHE_SIZE", "1024"))
+DASHBOARD_CACHE_TTL_SECONDS = float(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "60"))
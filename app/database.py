@@ -1,37 +1,218 @@
 """Database connection and session management."""
-from sqlalchemy import create_engine
+import functools
+from contextlib import asynccontextmanager
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
-from app.config import DATABASE_URL
+from app.config import (
+    DATABASE_URL, DATABASE_ASYNC, SQLITE_BUSY_TIMEOUT_MS, SQLITE_CACHE_SIZE_KB,
+    SQLITE_MAX_OVERFLOW, SQLITE_MMAP_SIZE, SQLITE_PERFORMANCE, SQLITE_POOL_SIZE
+)
 
-# Create database engine - handle SQLite vs PostgreSQL
-if DATABASE_URL.startswith("sqlite"):
-    engine = create_engine(
-        DATABASE_URL,
-        connect_args={"check_same_thread": False},
-        echo=False
-    )
-else:
-    engine = create_engine(
-        DATABASE_URL,
+
+def _is_sqlite_file(url: str) -> bool:
+    return url.startswith("sqlite") and ":memory:" not in url and not url.rstrip("/").endswith(":")
+
+
+def sqlite_pool_options(url: str, poolclass) -> dict:
+    """Pool settings for the SQLite performance profile.
+
+    A file database keeps a small pool of persistent connections; each one
+    carries its own page cache and mmap, and extra writers only queue on
+    the database lock. Overflow connections absorb bursts, so requests
+    holding two sessions wait for a connection instead of deadlocking.
+    """
+    if not (SQLITE_PERFORMANCE and _is_sqlite_file(url)):
+        return {}
+    return {"poolclass": poolclass, "pool_size": SQLITE_POOL_SIZE, "max_overflow": SQLITE_MAX_OVERFLOW}
+
+
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply the SQLite performance profile to a new connection."""
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers run alongside the single writer; NORMAL only syncs at checkpoints
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+
+def make_engine(url: str):
+    """Create a sync engine for `url` - handle SQLite vs PostgreSQL."""
+    if url.startswith("sqlite"):
+        sqlite_engine = create_engine(
+            url,
+            connect_args={"check_same_thread": False},
+            echo=False,
+            **sqlite_pool_options(url, QueuePool)
+        )
+        if SQLITE_PERFORMANCE:
+            event.listen(sqlite_engine, "connect", set_sqlite_pragmas)
+        return sqlite_engine
+    return create_engine(
+        url,
         pool_size=5,
         max_overflow=10,
         pool_pre_ping=True,
         echo=False
     )
 
+
+# Create database engine
+engine = make_engine(DATABASE_URL)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+def async_database_url(url: str) -> str:
+    """Map a database URL onto its asyncio driver."""
+    scheme, rest = url.split(":", 1)
+    if scheme.startswith("sqlite"):
+        return f"sqlite+aiosqlite:{rest}"
+    if scheme.startswith("postgres"):
+        return f"postgresql+asyncpg:{rest}"
+    return url
+
+
+def make_async_engine(url: str):
+    """Create an asyncio engine for `url`."""
+    if url.startswith("sqlite"):
+        sqlite_engine = create_async_engine(
+            async_database_url(url),
+            echo=False,
+            **sqlite_pool_options(url, AsyncAdaptedQueuePool)
+        )
+        if SQLITE_PERFORMANCE:
+            event.listen(sqlite_engine.sync_engine, "connect", set_sqlite_pragmas)
+        return sqlite_engine
+    return create_async_engine(
+        async_database_url(url),
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        echo=False
+    )
+
+
+# Async engine, only created when enabled so the async drivers stay optional
+async_engine = None
+AsyncSessionLocal = None
+if DATABASE_ASYNC:
+    async_engine = make_async_engine(DATABASE_URL)
+    # Objects are read after commit on the event loop, where lazy loads cannot run
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+async def warm_up_engines():
+    """Open a first async connection before requests arrive.
+
+    Dialect initialization on the first connection holds a thread lock
+    across awaits, so concurrent first requests would block the event loop.
+    """
+    if async_engine is not None:
+        async with async_engine.connect():
+            pass
+
+
+async def dispose_engines():
+    """Close the pooled connections of the sync and async engines."""
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
+
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+def get_sync_db():
     """Dependency to get database session."""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# Session dependency used by the routers, picked by DATABASE_ASYNC
+get_db = get_async_db if DATABASE_ASYNC else get_sync_db
+
+
+@asynccontextmanager
+async def db_session():
+    """Open a session of the configured mode outside of a request dependency."""
+    if DATABASE_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield db
+        finally:
+            db.close()
+
+
+async def run_db(db, func, *args):
+    """Run sync ORM code `func(session, *args)` without blocking the event loop.
+
+    Async sessions run it through AsyncSession.run_sync, sync sessions in
+    the threadpool.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(func, *args)
+    return await run_in_threadpool(func, db, *args)
+
+
+def session_handler(func):
+    """Adapt a sync route handler taking `db` to the configured session mode.
+
+    In async mode the handler becomes a coroutine whose body runs through
+    run_db, so the ORM code is shared by both modes. In sync mode it is
+    returned untouched and FastAPI runs it in the threadpool.
+    """
+    if not DATABASE_ASYNC:
+        return func
+    
+    @functools.wraps(func)
+    async def handler(*args, db, **kwargs):
+        return await run_db(db, lambda session: func(*args, db=session, **kwargs))
+    
+    return handler
+
+
+# INSERT constructs supporting ON CONFLICT, which every fitness and health write relies on
+UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def check_upsert_support(bind) -> None:
+    """Refuse to start on a database the write paths cannot run on."""
+    dialect = bind.dialect.name
+    if dialect not in UPSERT_INSERTS:
+        raise RuntimeError(
+            f"DATABASE_URL points to {dialect}, but writes need INSERT ... ON CONFLICT; "
+            f"use one of: {', '.join(sorted(UPSERT_INSERTS))}"
+        )
+
+
+def upsert_insert(db, table):
+    """Return a dialect-specific INSERT for `table` supporting ON CONFLICT.
+    
+    check_upsert_support has rejected other dialects at startup.
+    """
+    return UPSERT_INSERTS[db.get_bind().dialect.name](table)
@@ -0,0 +1,74 @@
+"""Shape-preserving downsampling of time series with NumPy.
+
+Both algorithms return indices into the input arrays, sorted ascending, so
+callers can pick the matching dates and values. Inputs must not contain
+NaN; use `downsample` to drop missing values first.
+"""
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets: keep `threshold` visually significant points.
+    
+    The first and last points are always kept. Every bucket in between
+    contributes the point forming the largest triangle with the previously
+    kept point and the average of the next bucket.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = x.astype(np.float64)
+    y = y.astype(np.float64)
+    
+    # threshold - 2 buckets over the points between the first and the last
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / counts
+    # The last bucket looks ahead to the final point
+    avg_x = np.append(avg_x[1:], x[n - 1])
+    avg_y = np.append(avg_y[1:], y[n - 1])
+    
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        px, py = x[previous], y[previous]
+        areas = np.abs(
+            (px - avg_x[bucket]) * (y[start:end] - py)
+            - (px - x[start:end]) * (avg_y[bucket] - py)
+        )
+        previous = start + int(np.argmax(areas))
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Keep the minimum and maximum of `threshold // 2` equal-count buckets."""
+    n = len(x)
+    if threshold >= n or threshold < 2:
+        return np.arange(n)
+    
+    buckets = threshold // 2
+    bucket_ids = np.arange(n) * buckets // n
+    # Sort by bucket, then value: each bucket's first entry is its min, its last the max
+    order = np.lexsort((y, bucket_ids))
+    starts = np.searchsorted(bucket_ids[order], np.arange(buckets))
+    ends = np.append(starts[1:], n) - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+ALGORITHMS = {
+    "lttb": lttb_indices,
+    "minmax": minmax_indices,
+}
+
+
+def downsample(x: np.ndarray, y: np.ndarray, threshold: int, method: str = "lttb") -> np.ndarray:
+    """Return indices into `x`/`y` of at most `threshold` points, skipping NaN values."""
+    present = np.flatnonzero(~np.isnan(y))
+    kept = ALGORITHMS[method](x[present], y[present], threshold)
+    return present[kept]
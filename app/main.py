@@ -1,21 +1,54 @@
 """Main FastAPI application entry point."""
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import API_HOST, API_PORT
-from app.database import engine, Base
-from app.routers import auth, fitness, health
+from app.database import engine, Base, SessionLocal, check_upsert_support, dispose_engines, warm_up_engines
+from app.pagination import NEXT_CURSOR_HEADER
+from app.pubsub import hub
+from app.replicas import dispose_replicas, replicas, warm_up_replicas
+from app.rollups import backfill_rollups
+from app.routers import auth, events, export, fitness, health
+from app.security import user_cache, token_cache
+from app.sync import SYNCED_AT_HEADER
+
+# Fail fast on a database the write paths cannot use
+check_upsert_support(engine)
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
+# create_all skips indexes added to tables that already exist
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
+# Summaries read only the rollups, fill them on databases that predate them
+with SessionLocal() as db:
+    backfill_rollups(db)
+    db.commit()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await warm_up_engines()
+    await warm_up_replicas()
+    yield
+    # Pooled connections (and aiosqlite worker threads) would outlive the app
+    await dispose_replicas()
+    await dispose_engines()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="Fitness & Health Tracker API",
     description="A comprehensive fitness and health tracking API with JWT authentication",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Configure CORS for dashboard access
@@ -25,12 +58,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, SYNCED_AT_HEADER, "ETag"],
 )
 
 # Include routers
 app.include_router(auth.router)
 app.include_router(fitness.router)
 app.include_router(health.router)
+app.include_router(export.router)
+app.include_router(events.router)
 
 
 @app.get("/", tags=["Root"])
@@ -50,6 +86,25 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/cache", tags=["Health Check"])
+def cache_stats():
+    """Hit/miss counters of the in-process caches."""
+    return {"users": user_cache.stats(), "tokens": token_cache.stats()}
+
+
+@app.get("/health/replicas", tags=["Health Check"])
+def replica_stats():
+    """Configured and currently healthy read replicas."""
+    return replicas.stats()
+
+
+@app.get("/health/events", tags=["Health Check"])
+def event_stats():
+    """Open change event streams and delivered/dropped event counters."""
+    return hub.stats()
+
+
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run("app.main:app", host=API_HOST, port=API_PORT, reload=True)
+    # Event streams never end on their own, so shutdown closes them after a grace period
+    uvicorn.run("app.main:app", host=API_HOST, port=API_PORT, reload=True, timeout_graceful_shutdown=5)
@@ -36,6 +36,18 @@ class User(Base):
         back_populates="user",
         cascade="all, delete-orphan"
     )
+    daily_rollups = relationship(
+        "DailyRollup",
+        cascade="all, delete-orphan"
+    )
+    data_versions = relationship(
+        "DataVersion",
+        cascade="all, delete-orphan"
+    )
+    deleted_records = relationship(
+        "DeletedRecord",
+        cascade="all, delete-orphan"
+    )
 
 
 class FitnessRecord(Base):
@@ -65,6 +77,7 @@ class FitnessRecord(Base):
     __table_args__ = (
         Index('idx_fitness_user_date', 'user_id', 'date'),
         Index('idx_fitness_workout_type', 'workout_type'),
+        Index('idx_fitness_user_updated', 'user_id', 'updated_at'),
     )
 
 
@@ -93,5 +106,55 @@ class HealthMetric(Base):
     # Indexes
     __table_args__ = (
         Index('idx_health_user_date', 'user_id', 'date'),
+        Index('idx_health_user_updated', 'user_id', 'updated_at'),
         UniqueConstraint('user_id', 'date', name='unique_user_date'),
     )
+
+
+class DailyRollup(Base):
+    """Per-user daily workout totals, maintained alongside fitness records."""
+    __tablename__ = "daily_rollups"
+
+    user_id = Column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    date = Column(Date, primary_key=True)
+    workout_type = Column(String(50), primary_key=True)
+    workout_count = Column(Integer, nullable=False, default=0)
+    total_duration_minutes = Column(Integer, nullable=False, default=0)
+    total_calories = Column(Integer, nullable=False, default=0)
+    total_distance_km = Column(Float, nullable=False, default=0.0)
+
+
+class DataVersion(Base):
+    """Per-user change counter of a resource, bumped by every write to it."""
+    __tablename__ = "data_versions"
+
+    user_id = Column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True
+    )
+    resource = Column(String(20), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class DeletedRecord(Base):
+    """Tombstone of a deleted row, lets delta sync clients drop their copy."""
+    __tablename__ = "deleted_records"
+
+    id = Column(String(36), primary_key=True)
+    user_id = Column(
+        String(36),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+    resource = Column(String(20), nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_deleted_user_resource_time', 'user_id', 'resource', 'deleted_at'),
+    )
@@ -0,0 +1,50 @@
+"""Single-statement writes scoped to the owning user.
+
+The UPDATE/DELETE carries both the id and the user_id in its WHERE clause
+and returns the affected row, so the common case is one round trip. Only
+when nothing matched does the caller probe for the id to tell a missing
+row (404) from someone else's (403).
+"""
+from typing import Any, Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.orm import Session
+
+
+def update_owned(db: Session, model, record_id: str, user_id: str, values: Dict[str, Any]) -> Optional[Any]:
+    """Update the user's row `record_id` and return it, or None if no row matched."""
+    stmt = update(model).where(model.id == record_id, model.user_id == user_id).values(**values)
+    
+    if db.get_bind().dialect.update_returning:
+        return db.scalars(
+            stmt.returning(model),
+            execution_options={"populate_existing": True, "synchronize_session": False}
+        ).first()
+    
+    # No UPDATE ... RETURNING on this backend
+    if db.execute(stmt, execution_options={"synchronize_session": False}).rowcount == 0:
+        return None
+    return db.get(model, record_id, populate_existing=True)
+
+
+def delete_owned(db: Session, model, record_id: str, user_id: str, *columns) -> Optional[Any]:
+    """Delete the user's row `record_id` and return `columns` of it, or None."""
+    columns = columns or (model.id,)
+    where = (model.id == record_id, model.user_id == user_id)
+    
+    if db.get_bind().dialect.delete_returning:
+        return db.execute(
+            delete(model).where(*where).returning(*columns),
+            execution_options={"synchronize_session": False}
+        ).first()
+    
+    # No DELETE ... RETURNING on this backend
+    row = db.execute(select(*columns).where(*where)).first()
+    if row is not None:
+        db.execute(delete(model).where(*where), execution_options={"synchronize_session": False})
+    return row
+
+
+def row_exists(db: Session, model, record_id: str) -> bool:
+    """Cheap primary key probe used to tell 404 from 403."""
+    return db.execute(select(model.id).where(model.id == record_id)).first() is not None
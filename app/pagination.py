@@ -0,0 +1,60 @@
+"""Keyset (cursor) pagination helpers for list endpoints."""
+import base64
+from datetime import date
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import tuple_
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(row_date: date, row_id: str) -> str:
+    """Encode the (date, id) position of a row as an opaque cursor."""
+    raw = f"{row_date.isoformat()}|{row_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[date, str]:
+    """Decode a cursor produced by `encode_cursor`."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        row_date, row_id = raw.split("|", 1)
+        return date.fromisoformat(row_date), row_id
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={"code": "INVALID_CURSOR", "message": "Pagination cursor is malformed"}
+        )
+
+
+def paginate(query, model, limit: int, cursor: Optional[str] = None, offset: int = 0):
+    """Return one page of `query` ordered newest first and the next cursor.
+
+    With a cursor the page starts right after the encoded (date, id) position,
+    so the (user_id, date) index is range-scanned instead of skipping rows.
+    Without one the legacy offset is applied.
+    """
+    query = query.order_by(model.date.desc(), model.id.desc())
+
+    if cursor:
+        after_date, after_id = decode_cursor(cursor)
+        # The redundant date bound lets the planner use the (user_id, date) index
+        query = query.filter(
+            model.date <= after_date,
+            tuple_(model.date, model.id) < tuple_(after_date, after_id)
+        )
+    elif offset:
+        query = query.offset(offset)
+
+    # Fetch one extra row to know whether another page exists
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].date, rows[-1].id)
+
+    return rows, next_cursor
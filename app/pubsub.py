@@ -0,0 +1,85 @@
+"""In-process publish/subscribe hub for per-user change events.
+
+Subscribers are event-stream requests running on the event loop, each
+with a bounded queue. Publishers may run on any thread: writes commit in
+the threadpool in sync mode. Events are handed to the subscriber's loop,
+and a slow subscriber loses its oldest events instead of growing its
+queue. The hub lives in one process, so every API worker only notifies
+its own subscribers.
+"""
+import asyncio
+import threading
+from collections import defaultdict
+from typing import Any, Dict
+
+from app.config import EVENT_QUEUE_SIZE
+
+
+class Subscription:
+    """One subscriber's bounded queue of events."""
+    
+    def __init__(self, user_id: str, maxsize: int):
+        self.user_id = user_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.dropped = 0
+    
+    def offer(self, event: Dict[str, Any]) -> None:
+        """Queue `event`, dropping the oldest one when full. Runs on the loop."""
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class EventHub:
+    """Fan out events to the subscriptions of the user they belong to."""
+    
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self.published = 0
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+    
+    def subscribe(self, user_id: str) -> Subscription:
+        """Register a subscription for `user_id`. Call from the event loop."""
+        subscription = Subscription(user_id, self.queue_size)
+        with self._lock:
+            self._subscriptions[user_id].add(subscription)
+        return subscription
+    
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Remove a subscription, forgetting the user once none are left."""
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.user_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.user_id]
+    
+    def publish(self, user_id: str, event: Dict[str, Any]) -> None:
+        """Send `event` to every subscription of `user_id`. Safe from any thread."""
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(user_id, ()))
+            self.published += 1
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, event)
+            except RuntimeError:
+                # The subscriber's loop is closed, its stream is gone
+                self.unsubscribe(subscription)
+    
+    def stats(self) -> Dict[str, int]:
+        """Return subscriber and event counters."""
+        with self._lock:
+            subscriptions = [s for group in self._subscriptions.values() for s in group]
+            return {
+                "users": len(self._subscriptions),
+                "subscribers": len(subscriptions),
+                "published": self.published,
+                "dropped": sum(s.dropped for s in subscriptions),
+            }
+
+
+# Change events of the fitness and health routers
+hub = EventHub(EVENT_QUEUE_SIZE)
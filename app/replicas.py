@@ -0,0 +1,169 @@
+"""Read-replica routing for read-only endpoints."""
+import itertools
+import threading
+import time
+from typing import Dict, Optional
+
+from fastapi import Depends
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.cache import TTLCache
+from app.config import (
+    DATABASE_ASYNC, DATABASE_REPLICA_URLS, READ_YOUR_WRITES_SECONDS, REPLICA_RETRY_SECONDS
+)
+from app.database import get_db, make_async_engine, make_engine
+from app.security import CurrentUser, get_current_user
+
+# Upper bound on users pinned to the primary at once
+MAX_PINNED_USERS = 10000
+
+
+class ReplicaSet:
+    """Round-robin over replica engines, skipping ones that recently failed."""
+
+    def __init__(self, engines, retry_seconds: float):
+        self.engines = list(engines)
+        self.retry_seconds = retry_seconds
+        self._counter = itertools.count()
+        self._down_until = {}
+        self._lock = threading.Lock()
+
+    def choose(self):
+        """Return the next healthy replica engine, or None if there is none."""
+        if not self.engines:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            start = next(self._counter)
+            for offset in range(len(self.engines)):
+                engine = self.engines[(start + offset) % len(self.engines)]
+                if self._down_until.get(engine, 0) <= now:
+                    return engine
+        return None
+
+    def mark_down(self, engine) -> None:
+        """Skip `engine` for the retry window."""
+        with self._lock:
+            self._down_until[engine] = time.monotonic() + self.retry_seconds
+
+    def stats(self) -> Dict[str, int]:
+        """Return the number of configured and currently healthy replicas."""
+        now = time.monotonic()
+        with self._lock:
+            healthy = sum(1 for engine in self.engines if self._down_until.get(engine, 0) <= now)
+        return {"replicas": len(self.engines), "healthy": healthy}
+
+
+# Replica engines use the same driver mode as the primary
+replicas = ReplicaSet(
+    [make_async_engine(url) if DATABASE_ASYNC else make_engine(url) for url in DATABASE_REPLICA_URLS],
+    REPLICA_RETRY_SECONDS
+)
+
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncReplicaSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+# Users who wrote recently, their reads go to the primary until the entry expires
+_primary_pins = TTLCache(MAX_PINNED_USERS, READ_YOUR_WRITES_SECONDS)
+
+
+def pin_primary(user_id: str) -> None:
+    """Send the user's reads to the primary so they see their own writes."""
+    if replicas.engines:
+        _primary_pins.set(user_id, True)
+
+
+def _read_engine(user_id: str):
+    if _primary_pins.get(user_id):
+        return None
+    return replicas.choose()
+
+
+def _connect_replica(user_id: str) -> Optional[Session]:
+    for _ in range(len(replicas.engines)):
+        replica = _read_engine(user_id)
+        if replica is None:
+            return None
+        db = ReplicaSessionLocal(bind=replica)
+        try:
+            # Check out a connection now so a dead replica falls back here
+            db.connection()
+            return db
+        except (DBAPIError, OSError):
+            db.close()
+            replicas.mark_down(replica)
+    return None
+
+
+async def _connect_async_replica(user_id: str):
+    for _ in range(len(replicas.engines)):
+        replica = _read_engine(user_id)
+        if replica is None:
+            return None
+        db = AsyncReplicaSessionLocal(bind=replica)
+        try:
+            await db.connection()
+            return db
+        except (DBAPIError, OSError):
+            await db.close()
+            replicas.mark_down(replica)
+    return None
+
+
+def get_sync_read_db(
+    current_user: CurrentUser = Depends(get_current_user),
+    primary: Session = Depends(get_db)
+):
+    """Dependency to get a read-only session on a replica, or the primary.
+    
+    Primary reads reuse the request's session, which authentication may
+    already hold a connection for, so a request never needs two of them.
+    """
+    db = _connect_replica(current_user.id)
+    if db is None:
+        yield primary
+        return
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_read_db(
+    current_user: CurrentUser = Depends(get_current_user),
+    primary: AsyncSession = Depends(get_db)
+):
+    """Dependency to get a read-only async session on a replica, or the request's primary one."""
+    db = await _connect_async_replica(current_user.id)
+    if db is None:
+        yield primary
+        return
+    async with db:
+        yield db
+
+
+# Session dependency for read-only handlers, picked by DATABASE_ASYNC
+get_read_db = get_async_read_db if DATABASE_ASYNC else get_sync_read_db
+
+
+async def warm_up_replicas():
+    """Connect to each async replica once, marking unreachable ones down."""
+    if not DATABASE_ASYNC:
+        return
+    for replica in replicas.engines:
+        try:
+            async with replica.connect():
+                pass
+        except (DBAPIError, OSError):
+            replicas.mark_down(replica)
+
+
+async def dispose_replicas():
+    """Close the pooled connections of the replica engines."""
+    for replica in replicas.engines:
+        if DATABASE_ASYNC:
+            await replica.dispose()
+        else:
+            replica.dispose()
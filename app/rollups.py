@@ -0,0 +1,102 @@
+"""Incremental maintenance of the daily_rollups table.
+
+Every write to fitness_records applies a delta to the matching
+(user_id, date, workout_type) rollup row in the same transaction, so summary
+queries only have to read one row per day and workout type.
+"""
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, exists, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.database import upsert_insert
+from app.models import DailyRollup, FitnessRecord
+
+# Fitness record fields that feed into the rollups
+ROLLUP_FIELDS = ("date", "workout_type", "duration_minutes", "calories_burned", "distance_km")
+
+# Rollup columns that are accumulated from fitness records
+TOTAL_COLUMNS = ("workout_count", "total_duration_minutes", "total_calories", "total_distance_km")
+
+
+def apply_rollup_delta(db: Session, user_id: str, records: Iterable, sign: int = 1) -> None:
+    """Add (sign=1) or remove (sign=-1) fitness records from the daily rollups.
+
+    `records` may be ORM objects or validated schemas, anything exposing the
+    fields in ROLLUP_FIELDS as attributes.
+    """
+    deltas = {}
+    for record in records:
+        key = (record.date, record.workout_type)
+        totals = deltas.setdefault(key, [0, 0, 0, 0.0])
+        totals[0] += sign
+        totals[1] += sign * record.duration_minutes
+        totals[2] += sign * record.calories_burned
+        totals[3] += sign * (record.distance_km or 0.0)
+    
+    if not deltas:
+        return
+    
+    rows = [
+        {"user_id": user_id, "date": day, "workout_type": workout_type, **dict(zip(TOTAL_COLUMNS, totals))}
+        for (day, workout_type), totals in deltas.items()
+    ]
+    stmt = upsert_insert(db, DailyRollup).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "date", "workout_type"],
+        set_={column: getattr(DailyRollup, column) + stmt.excluded[column] for column in TOTAL_COLUMNS}
+    )
+    db.execute(stmt)
+    
+    # Drop rollups whose last workout was removed
+    if sign < 0:
+        db.execute(
+            delete(DailyRollup).where(
+                DailyRollup.user_id == user_id,
+                DailyRollup.workout_count <= 0
+            )
+        )
+
+
+def rebuild_rollups(db: Session, user_id: Optional[str] = None) -> int:
+    """Recompute rollups from fitness_records, for one user or everyone.
+
+    Returns the number of rollup rows written. The caller commits.
+    """
+    clear = delete(DailyRollup)
+    source = select(
+        FitnessRecord.user_id,
+        FitnessRecord.date,
+        FitnessRecord.workout_type,
+        func.count(FitnessRecord.id),
+        func.sum(FitnessRecord.duration_minutes),
+        func.sum(FitnessRecord.calories_burned),
+        func.coalesce(func.sum(FitnessRecord.distance_km), 0.0),
+    ).group_by(FitnessRecord.user_id, FitnessRecord.date, FitnessRecord.workout_type)
+    
+    if user_id is not None:
+        clear = clear.where(DailyRollup.user_id == user_id)
+        source = source.where(FitnessRecord.user_id == user_id)
+    
+    db.execute(clear)
+    result = db.execute(
+        insert(DailyRollup).from_select(
+            ["user_id", "date", "workout_type", *TOTAL_COLUMNS],
+            source
+        )
+    )
+    return result.rowcount
+
+
+def backfill_rollups(db: Session) -> int:
+    """Rebuild all rollups if the table is empty while fitness records exist.
+    
+    Covers databases created before rollups were maintained, whose new
+    daily_rollups table would otherwise leave every summary empty.
+    Returns the number of rollup rows written. The caller commits.
+    """
+    if db.execute(select(exists().select_from(DailyRollup))).scalar():
+        return 0
+    if not db.execute(select(exists().select_from(FitnessRecord))).scalar():
+        return 0
+    return rebuild_rollups(db)
@@ -1,4 +1,4 @@
 # API Routers
-from app.routers import auth, fitness, health
+from app.routers import auth, events, export, fitness, health
 
-__all__ = ["auth", "fitness", "health"]
+__all__ = ["auth", "events", "export", "fitness", "health"]
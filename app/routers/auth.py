@@ -2,17 +2,26 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_db, run_db
 from app.models import User
 from app.schemas import UserCreate, UserResponse, LoginRequest, TokenResponse
-from app.security import hash_password, verify_password, create_access_token, get_current_user
+from app.security import (
+    CurrentUser, PasswordHashBusy, create_access_token, get_current_user,
+    hash_password_async, needs_rehash, verify_password_async
+)
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    """Register a new user account."""
+def _service_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={"code": "SERVICE_BUSY", "message": "Too many login attempts in progress, retry shortly"},
+        headers={"Retry-After": "1"},
+    )
+
+
+def _check_user_available(db: Session, user_data: UserCreate) -> None:
     # Check for existing username
     existing_user = db.query(User).filter(User.username == user_data.username).first()
     if existing_user:
@@ -28,9 +37,9 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             status_code=status.HTTP_409_CONFLICT,
             detail={"code": "DUPLICATE_EMAIL", "message": "Email already registered"}
         )
-    
-    # Create new user
-    hashed_password = hash_password(user_data.password)
+
+
+def _create_user(db: Session, user_data: UserCreate, hashed_password: str) -> User:
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -44,19 +53,55 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
     return new_user
 
 
+def _find_user(db: Session, username: str) -> User:
+    return db.query(User).filter(User.username == username).first()
+
+
+def _update_password_hash(db: Session, user: User, hashed_password: str) -> None:
+    user.password_hash = hashed_password
+    db.commit()
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register(user_data: UserCreate, db: Session = Depends(get_db)):
+    """Register a new user account."""
+    await run_db(db, _check_user_available, user_data)
+    
+    # Hash on the dedicated bcrypt pool
+    try:
+        hashed_password = await hash_password_async(user_data.password)
+    except PasswordHashBusy:
+        raise _service_busy()
+    
+    return await run_db(db, _create_user, user_data, hashed_password)
+
+
 @router.post("/login", response_model=TokenResponse)
-def login(login_data: LoginRequest, db: Session = Depends(get_db)):
+async def login(login_data: LoginRequest, db: Session = Depends(get_db)):
     """Login and get JWT token."""
     # Find user by username
-    user = db.query(User).filter(User.username == login_data.username).first()
+    user = await run_db(db, _find_user, login_data.username)
     
-    if not user or not verify_password(login_data.password, user.password_hash):
+    try:
+        valid = user is not None and await verify_password_async(login_data.password, user.password_hash)
+    except PasswordHashBusy:
+        raise _service_busy()
+    
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={"code": "INVALID_CREDENTIALS", "message": "Invalid username or password"},
             headers={"WWW-Authenticate": "Bearer"},
         )
     
+    # Upgrade hashes created with an outdated cost, best effort
+    if needs_rehash(user.password_hash):
+        try:
+            new_hash = await hash_password_async(login_data.password)
+            await run_db(db, _update_password_hash, user, new_hash)
+        except PasswordHashBusy:
+            pass
+    
     # Create access token
     access_token = create_access_token(user.id)
     
@@ -64,6 +109,6 @@ def login(login_data: LoginRequest, db: Session = Depends(get_db)):
 
 
 @router.get("/me", response_model=UserResponse)
-def get_current_user_info(current_user: User = Depends(get_current_user)):
+def get_current_user_info(current_user: CurrentUser = Depends(get_current_user)):
     """Get current authenticated user information."""
     return current_user
@@ -0,0 +1,60 @@
+"""Server-Sent Events stream of the user's data changes."""
+import asyncio
+
+import orjson
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from app.config import EVENT_HEARTBEAT_SECONDS, EVENT_RETRY_MS, EVENT_TICKET_SECONDS
+from app.pubsub import hub
+from app.schemas import StreamTicketResponse
+from app.security import CurrentUser, create_stream_ticket, get_current_user, get_stream_user
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+
+def format_event(event: dict) -> bytes:
+    """Encode an event as an SSE message named after its type."""
+    return b"event: " + event["type"].encode("ascii") + b"\ndata: " + orjson.dumps(event) + b"\n\n"
+
+
+@router.post("/ticket", response_model=StreamTicketResponse)
+async def create_ticket(current_user: CurrentUser = Depends(get_current_user)):
+    """Issue a single-use ticket for opening the stream from EventSource.
+    
+    EventSource cannot send an Authorization header, and an access token in
+    the URL would end up in logs. Pass the ticket as `?ticket=` instead; it
+    expires after `EVENT_TICKET_SECONDS` and opens one stream.
+    """
+    return StreamTicketResponse(ticket=create_stream_ticket(current_user.id), expires_in=EVENT_TICKET_SECONDS)
+
+
+@router.get("")
+async def stream_events(current_user: CurrentUser = Depends(get_stream_user)):
+    """Stream a `change` event whenever the user's fitness or health data is written.
+    
+    Events carry the changed `resource` (`fitness` or `health`), not the
+    data; clients refetch it. A comment line is sent when idle to keep
+    proxies from closing the connection.
+    """
+    async def generate():
+        # Subscribed once the body starts, so a client gone before then leaves nothing behind
+        subscription = hub.subscribe(current_user.id)
+        try:
+            yield f"retry: {EVENT_RETRY_MS}\n\n".encode("ascii")
+            while True:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), EVENT_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                yield format_event(event)
+        finally:
+            # Runs when the client disconnects and the response task is cancelled
+            hub.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
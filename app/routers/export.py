@@ -0,0 +1,184 @@
+"""Full history export routes."""
+import csv
+import io
+import zlib
+from datetime import date, datetime
+from typing import Iterator, Optional
+
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+
+from app.database import SessionLocal
+from app.models import FitnessRecord, HealthMetric
+from app.responses import schema_columns
+from app.schemas import ExportFormat, FitnessRecordResponse, HealthMetricResponse
+from app.security import CurrentUser, get_download_user
+
+router = APIRouter(prefix="/export", tags=["Export"])
+
+# Rows fetched from the server-side cursor and written per chunk
+EXPORT_BATCH_SIZE = 1000
+
+# Rows per Parquet row group, larger groups compress and scan better
+PARQUET_ROW_GROUP_SIZE = 64 * 1024
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.ARROW: "application/vnd.apache.arrow.stream",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+}
+
+# Arrow column type per Python type of the SQLAlchemy column
+ARROW_TYPES = {
+    str: pa.string(),
+    int: pa.int64(),
+    float: pa.float64(),
+    date: pa.date32(),
+    datetime: pa.timestamp("us"),
+}
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
+
+
+def _drain(buffer: io.BytesIO) -> bytes:
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data
+
+
+def _ndjson_chunks(result, columns) -> Iterator[bytes]:
+    for batch in result.partitions():
+        yield b"".join(orjson.dumps(row._asdict()) + b"\n" for row in batch)
+
+
+def _csv_chunks(result, columns) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([column.name for column in columns])
+    for batch in result.partitions():
+        writer.writerows([_csv_value(value) for value in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only for an empty history
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+def arrow_schema(columns) -> pa.Schema:
+    """Arrow schema matching the selected table columns."""
+    return pa.schema([
+        pa.field(column.name, ARROW_TYPES[column.type.python_type], nullable=column.nullable)
+        for column in columns
+    ])
+
+
+def _record_batch(rows, schema: pa.Schema) -> pa.RecordBatch:
+    """Transpose fetched rows into one Arrow array per column."""
+    values = list(zip(*rows))
+    return pa.RecordBatch.from_arrays(
+        [pa.array(column, type=field.type) for column, field in zip(values, schema)],
+        schema=schema
+    )
+
+
+def _arrow_chunks(result, columns) -> Iterator[bytes]:
+    schema = arrow_schema(columns)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, schema) as writer:
+        # The schema message goes out before the first row is fetched
+        yield _drain(sink)
+        for batch in result.partitions():
+            writer.write_batch(_record_batch(batch, schema))
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+def _parquet_chunks(result, columns) -> Iterator[bytes]:
+    schema = arrow_schema(columns)
+    sink = io.BytesIO()
+    with pq.ParquetWriter(sink, schema) as writer:
+        for batch in result.partitions(PARQUET_ROW_GROUP_SIZE):
+            writer.write_batch(_record_batch(batch, schema))
+            yield _drain(sink)
+    yield _drain(sink)
+
+
+# Encoder per format, each turns a streamed result into byte chunks
+ENCODERS = {
+    ExportFormat.NDJSON: _ndjson_chunks,
+    ExportFormat.CSV: _csv_chunks,
+    ExportFormat.ARROW: _arrow_chunks,
+    ExportFormat.PARQUET: _parquet_chunks,
+}
+
+
+def _gzip_chunks(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Gzip a chunk stream, flushing after each chunk so bytes go out right away."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def _stream_export(model, schema, user_id: str, start_date, end_date, export_format, gzip):
+    """Stream a user's rows straight from a server-side cursor."""
+    columns = schema_columns(model, schema)
+    stmt = select(*columns).where(model.user_id == user_id)
+    if start_date:
+        stmt = stmt.where(model.date >= start_date)
+    if end_date:
+        stmt = stmt.where(model.date <= end_date)
+    # Date order alone follows the (user_id, date) index, so no sort delays the first row
+    stmt = stmt.order_by(model.date).execution_options(yield_per=EXPORT_BATCH_SIZE)
+    
+    def generate():
+        # The session lives as long as the response body, not the request handler
+        db = SessionLocal()
+        try:
+            chunks = ENCODERS[export_format](db.execute(stmt), columns)
+            yield from _gzip_chunks(chunks) if gzip else chunks
+        finally:
+            db.close()
+    
+    filename = f"{model.__tablename__.replace('_', '-')}.{export_format.value}"
+    headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(generate(), media_type=MEDIA_TYPES[export_format], headers=headers)
+
+
+@router.get("/fitness-records")
+def export_fitness_records(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="ndjson, csv, arrow or parquet"),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+    start_date: Optional[date] = Query(None, description="Filter by start date"),
+    end_date: Optional[date] = Query(None, description="Filter by end date"),
+    current_user: CurrentUser = Depends(get_download_user)
+):
+    """Stream the user's complete fitness history, oldest first."""
+    return _stream_export(
+        FitnessRecord, FitnessRecordResponse, current_user.id, start_date, end_date, export_format, gzip
+    )
+
+
+@router.get("/health-metrics")
+def export_health_metrics(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format", description="ndjson, csv, arrow or parquet"),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+    start_date: Optional[date] = Query(None, description="Filter by start date"),
+    end_date: Optional[date] = Query(None, description="Filter by end date"),
+    current_user: CurrentUser = Depends(get_download_user)
+):
+    """Stream the user's complete health metric history, oldest first."""
+    return _stream_export(
+        HealthMetric, HealthMetricResponse, current_user.id, start_date, end_date, export_format, gzip
+    )
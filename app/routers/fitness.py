@@ -1,34 +1,76 @@
 """Fitness records routes."""
-from datetime import date
+from datetime import date, datetime
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 
-from app.database import get_db
-from app.models import User, FitnessRecord
+from app.database import get_db, session_handler
+from app.models import FitnessRecord, DailyRollup, generate_uuid
+from app.ownership import delete_owned, row_exists, update_owned
+from app.pagination import paginate, NEXT_CURSOR_HEADER
+from app.rollups import apply_rollup_delta, ROLLUP_FIELDS
 from app.schemas import (
     FitnessRecordCreate,
     FitnessRecordUpdate,
-    FitnessRecordResponse
+    FitnessRecordResponse,
+    FitnessRecordBatchCreate,
+    FitnessRecordBatchResponse,
+    FitnessSummaryResponse,
+    BatchItemResult,
+    DeletedRecordResponse,
+    ErrorDetail,
+    SummaryBucket
 )
-from app.security import get_current_user
+from app.replicas import get_read_db, pin_primary
+from app.responses import json_rows, schema_columns
+from app.security import CurrentUser, get_current_user
+from app.summaries import bucket_start
+from app.sync import SYNCED_AT_HEADER, changed_after, deleted_since, record_deletion, set_synced_at
+from app.versions import FITNESS, bump_version, conditional_get
 
 router = APIRouter(prefix="/fitness-records", tags=["Fitness Records"])
 
 
+def _record_access_error(db: Session, record_id: str) -> HTTPException:
+    """404 if the record does not exist, 403 if it belongs to someone else."""
+    if not row_exists(db, FitnessRecord, record_id):
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "RESOURCE_NOT_FOUND", "message": "Fitness record not found"}
+        )
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail={"code": "ACCESS_DENIED", "message": "You do not have access to this record"}
+    )
+
+
 @router.get("", response_model=List[FitnessRecordResponse])
+@session_handler
 def list_fitness_records(
+    request: Request,
+    response: Response,
     start_date: Optional[date] = Query(None, description="Filter by start date"),
     end_date: Optional[date] = Query(None, description="Filter by end date"),
     workout_type: Optional[str] = Query(None, description="Filter by workout type"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
-    offset: int = Query(0, ge=0, description="Number of records to skip"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    offset: int = Query(0, ge=0, description="Number of records to skip (ignored with cursor)"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    changed_since: Optional[datetime] = Query(None, description=f"Only rows written since this {SYNCED_AT_HEADER} watermark"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """List fitness records for the current user with optional filters."""
-    query = db.query(FitnessRecord).filter(FitnessRecord.user_id == current_user.id)
+    not_modified = conditional_get(request, response, db, current_user.id, FITNESS)
+    if not_modified:
+        return not_modified
+    set_synced_at(response)
+    
+    # Plain column rows, serialized without building ORM objects
+    columns = schema_columns(FitnessRecord, FitnessRecordResponse)
+    query = db.query(*columns).filter(FitnessRecord.user_id == current_user.id)
     
     # Apply date filters
     if start_date:
@@ -36,20 +78,27 @@ def list_fitness_records(
     if end_date:
         query = query.filter(FitnessRecord.date <= end_date)
     
+    # Delta sync, served by the (user_id, updated_at) index
+    if changed_since:
+        query = query.filter(changed_after(FitnessRecord, changed_since))
+    
     # Apply workout type filter
     if workout_type:
         query = query.filter(FitnessRecord.workout_type == workout_type)
     
     # Order by date descending and apply pagination
-    records = query.order_by(FitnessRecord.date.desc()).offset(offset).limit(limit).all()
+    records, next_cursor = paginate(query, FitnessRecord, limit, cursor=cursor, offset=offset)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    return records
+    return json_rows(records, response)
 
 
 @router.post("", response_model=FitnessRecordResponse, status_code=status.HTTP_201_CREATED)
+@session_handler
 def create_fitness_record(
     record_data: FitnessRecordCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new fitness record."""
@@ -65,17 +114,153 @@ def create_fitness_record(
     )
     
     db.add(new_record)
+    apply_rollup_delta(db, current_user.id, [new_record])
+    bump_version(db, current_user.id, FITNESS)
     db.commit()
+    pin_primary(current_user.id)
     db.refresh(new_record)
     
     return new_record
 
 
+@router.post("/batch", response_model=FitnessRecordBatchResponse)
+@session_handler
+def create_fitness_records_batch(
+    batch: FitnessRecordBatchCreate,
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create many fitness records in a single transaction.
+
+    Each item is validated independently; valid items are inserted with one
+    bulk INSERT and invalid ones are reported in the per-item results.
+    """
+    results = []
+    rows = []
+    valid_records = []
+    
+    for index, item in enumerate(batch.records):
+        try:
+            record_data = FitnessRecordCreate.model_validate(item)
+        except ValidationError as exc:
+            error = exc.errors()[0]
+            location = ".".join(str(part) for part in error["loc"])
+            message = f"{location}: {error['msg']}" if location else error["msg"]
+            results.append(BatchItemResult(
+                index=index,
+                status="error",
+                error=ErrorDetail(code="VALIDATION_ERROR", message=message)
+            ))
+            continue
+        
+        record_id = generate_uuid()
+        valid_records.append(record_data)
+        rows.append({"id": record_id, "user_id": current_user.id, **record_data.model_dump()})
+        results.append(BatchItemResult(index=index, status="created", id=record_id))
+    
+    # Bulk insert without loading ORM objects back
+    if rows:
+        db.execute(insert(FitnessRecord), rows)
+        apply_rollup_delta(db, current_user.id, valid_records)
+        bump_version(db, current_user.id, FITNESS)
+        db.commit()
+        pin_primary(current_user.id)
+    
+    return FitnessRecordBatchResponse(
+        created=len(rows),
+        failed=len(results) - len(rows),
+        results=results
+    )
+
+
+@router.get("/summary", response_model=FitnessSummaryResponse)
+@session_handler
+def summarize_fitness_records(
+    request: Request,
+    response: Response,
+    start_date: Optional[date] = Query(None, description="Filter by start date"),
+    end_date: Optional[date] = Query(None, description="Filter by end date"),
+    workout_type: Optional[str] = Query(None, description="Filter by workout type"),
+    bucket: SummaryBucket = Query(SummaryBucket.DAY, description="Time bucket for per-period totals"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Aggregate fitness records per time bucket and per workout type.
+
+    Totals come from the incrementally maintained daily_rollups table.
+    """
+    not_modified = conditional_get(request, response, db, current_user.id, FITNESS)
+    if not_modified:
+        return not_modified
+    
+    filters = [DailyRollup.user_id == current_user.id]
+    if start_date:
+        filters.append(DailyRollup.date >= start_date)
+    if end_date:
+        filters.append(DailyRollup.date <= end_date)
+    if workout_type:
+        filters.append(DailyRollup.workout_type == workout_type)
+    
+    # Read the daily rollups only, cost scales with days rather than workouts
+    workout_count = func.sum(DailyRollup.workout_count)
+    total_duration = func.sum(DailyRollup.total_duration_minutes)
+    total_calories = func.sum(DailyRollup.total_calories)
+    totals = (
+        workout_count.label("workout_count"),
+        total_duration.label("total_duration_minutes"),
+        total_calories.label("total_calories"),
+        func.sum(DailyRollup.total_distance_km).label("total_distance_km"),
+        (total_duration * 1.0 / workout_count).label("avg_duration_minutes"),
+        (total_calories * 1.0 / workout_count).label("avg_calories"),
+    )
+    
+    period = bucket_start(DailyRollup.date, bucket, db.get_bind().dialect.name).label("period")
+    periods = (
+        db.query(period, *totals)
+        .filter(*filters)
+        .group_by(period)
+        .order_by(period)
+        .all()
+    )
+    workout_types = (
+        db.query(DailyRollup.workout_type, *totals)
+        .filter(*filters)
+        .group_by(DailyRollup.workout_type)
+        .order_by(workout_count.desc())
+        .all()
+    )
+    
+    return {
+        "bucket": bucket,
+        "periods": [row._asdict() for row in periods],
+        "workout_types": [row._asdict() for row in workout_types]
+    }
+
+
+@router.get("/deleted", response_model=List[DeletedRecordResponse])
+@session_handler
+def list_deleted_fitness_records(
+    request: Request,
+    response: Response,
+    since: Optional[datetime] = Query(None, description=f"{SYNCED_AT_HEADER} watermark of the previous sync"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """List ids of fitness records deleted since the last sync, oldest first."""
+    not_modified = conditional_get(request, response, db, current_user.id, FITNESS)
+    if not_modified:
+        return not_modified
+    set_synced_at(response)
+    
+    return json_rows(deleted_since(db, current_user.id, FITNESS, since), response)
+
+
 @router.get("/{record_id}", response_model=FitnessRecordResponse)
+@session_handler
 def get_fitness_record(
     record_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific fitness record by ID."""
     record = db.query(FitnessRecord).filter(FitnessRecord.id == record_id).first()
@@ -97,62 +282,62 @@ def get_fitness_record(
 
 
 @router.put("/{record_id}", response_model=FitnessRecordResponse)
+@session_handler
 def update_fitness_record(
     record_id: str,
     update_data: FitnessRecordUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update a fitness record."""
-    record = db.query(FitnessRecord).filter(FitnessRecord.id == record_id).first()
+    update_dict = update_data.model_dump(exclude_unset=True)
     
-    if not record:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={"code": "RESOURCE_NOT_FOUND", "message": "Fitness record not found"}
-        )
+    # Moving the record between rollups needs its previous values
+    previous = None
+    if any(field in update_dict for field in ROLLUP_FIELDS):
+        previous = db.execute(
+            select(*(getattr(FitnessRecord, field) for field in ROLLUP_FIELDS))
+            .where(FitnessRecord.id == record_id, FitnessRecord.user_id == current_user.id)
+            .with_for_update()
+        ).first()
+        if previous is None:
+            raise _record_access_error(db, record_id)
     
-    # Check ownership
-    if record.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={"code": "ACCESS_DENIED", "message": "You do not have access to this record"}
-        )
+    record = update_owned(db, FitnessRecord, record_id, current_user.id, update_dict)
+    if record is None:
+        raise _record_access_error(db, record_id)
     
-    # Update fields
-    update_dict = update_data.model_dump(exclude_unset=True)
-    for field, value in update_dict.items():
-        setattr(record, field, value)
+    if previous is not None:
+        apply_rollup_delta(db, current_user.id, [previous], sign=-1)
+        apply_rollup_delta(db, current_user.id, [record])
     
+    response = FitnessRecordResponse.model_validate(record)
+    bump_version(db, current_user.id, FITNESS)
     db.commit()
-    db.refresh(record)
+    pin_primary(current_user.id)
     
-    return record
+    return response
 
 
 @router.delete("/{record_id}", status_code=status.HTTP_204_NO_CONTENT)
+@session_handler
 def delete_fitness_record(
     record_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a fitness record."""
-    record = db.query(FitnessRecord).filter(FitnessRecord.id == record_id).first()
-    
-    if not record:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={"code": "RESOURCE_NOT_FOUND", "message": "Fitness record not found"}
-        )
-    
-    # Check ownership
-    if record.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={"code": "ACCESS_DENIED", "message": "You do not have access to this record"}
-        )
+    deleted = delete_owned(
+        db, FitnessRecord, record_id, current_user.id,
+        *(getattr(FitnessRecord, field) for field in ROLLUP_FIELDS)
+    )
+    if deleted is None:
+        raise _record_access_error(db, record_id)
     
-    db.delete(record)
+    apply_rollup_delta(db, current_user.id, [deleted], sign=-1)
+    record_deletion(db, current_user.id, FITNESS, record_id)
+    bump_version(db, current_user.id, FITNESS)
     db.commit()
+    pin_primary(current_user.id)
     
     return None
@@ -1,34 +1,86 @@
 """Health metrics routes."""
-from datetime import date
+from datetime import date, datetime
 from typing import Optional, List
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
-from app.database import get_db
-from app.models import User, HealthMetric
+from app.database import get_db, session_handler, upsert_insert
+from app.downsampling import downsample
+from app.models import HealthMetric, generate_uuid
+from app.ownership import delete_owned, row_exists, update_owned
+from app.pagination import paginate, NEXT_CURSOR_HEADER
 from app.schemas import (
+    DeletedRecordResponse,
     HealthMetricCreate,
     HealthMetricUpdate,
-    HealthMetricResponse
+    HealthMetricResponse,
+    HealthMetricBatchUpsert,
+    HealthMetricField,
+    HealthSummaryResponse,
+    MergePolicy,
+    SummaryBucket,
+    DownsampleMethod,
+    TimeSeriesResponse
 )
-from app.security import get_current_user
+from app.replicas import get_read_db, pin_primary
+from app.responses import json_rows, schema_columns
+from app.security import CurrentUser, get_current_user
+from app.summaries import bucket_start
+from app.sync import SYNCED_AT_HEADER, changed_after, deleted_since, record_deletion, set_synced_at
+from app.versions import HEALTH, bump_version, conditional_get
 
 router = APIRouter(prefix="/health-metrics", tags=["Health Metrics"])
 
+# Metric columns merged by batch upserts
+METRIC_FIELDS = ("weight_kg", "steps", "water_intake_liters", "sleep_hours", "heart_rate_bpm")
+
+# Rows per INSERT statement, keeps bound parameters below SQLite limits
+UPSERT_CHUNK_SIZE = 500
+
+# Upper bound on the point budget of a time series
+MAX_SERIES_POINTS = 5000
+
+
+def _metric_access_error(db: Session, metric_id: str) -> HTTPException:
+    """404 if the metric does not exist, 403 if it belongs to someone else."""
+    if not row_exists(db, HealthMetric, metric_id):
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail={"code": "RESOURCE_NOT_FOUND", "message": "Health metric not found"}
+        )
+    return HTTPException(
+        status_code=status.HTTP_403_FORBIDDEN,
+        detail={"code": "ACCESS_DENIED", "message": "You do not have access to this metric"}
+    )
+
 
 @router.get("", response_model=List[HealthMetricResponse])
+@session_handler
 def list_health_metrics(
+    request: Request,
+    response: Response,
     start_date: Optional[date] = Query(None, description="Filter by start date"),
     end_date: Optional[date] = Query(None, description="Filter by end date"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum records to return"),
-    offset: int = Query(0, ge=0, description="Number of records to skip"),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    offset: int = Query(0, ge=0, description="Number of records to skip (ignored with cursor)"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    changed_since: Optional[datetime] = Query(None, description=f"Only rows written since this {SYNCED_AT_HEADER} watermark"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """List health metrics for the current user with optional filters."""
-    query = db.query(HealthMetric).filter(HealthMetric.user_id == current_user.id)
+    not_modified = conditional_get(request, response, db, current_user.id, HEALTH)
+    if not_modified:
+        return not_modified
+    set_synced_at(response)
+    
+    # Plain column rows, serialized without building ORM objects
+    columns = schema_columns(HealthMetric, HealthMetricResponse)
+    query = db.query(*columns).filter(HealthMetric.user_id == current_user.id)
     
     # Apply date filters
     if start_date:
@@ -36,16 +88,23 @@ def list_health_metrics(
     if end_date:
         query = query.filter(HealthMetric.date <= end_date)
     
+    # Delta sync, served by the (user_id, updated_at) index
+    if changed_since:
+        query = query.filter(changed_after(HealthMetric, changed_since))
+    
     # Order by date descending and apply pagination
-    metrics = query.order_by(HealthMetric.date.desc()).offset(offset).limit(limit).all()
+    metrics, next_cursor = paginate(query, HealthMetric, limit, cursor=cursor, offset=offset)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
-    return metrics
+    return json_rows(metrics, response)
 
 
 @router.post("", response_model=HealthMetricResponse, status_code=status.HTTP_201_CREATED)
+@session_handler
 def create_health_metric(
     metric_data: HealthMetricCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Create a new health metric."""
@@ -73,7 +132,9 @@ def create_health_metric(
     
     try:
         db.add(new_metric)
+        bump_version(db, current_user.id, HEALTH)
         db.commit()
+        pin_primary(current_user.id)
         db.refresh(new_metric)
     except IntegrityError:
         db.rollback()
@@ -85,11 +146,185 @@ def create_health_metric(
     return new_metric
 
 
+@router.put("/batch", response_model=List[HealthMetricResponse])
+@session_handler
+def upsert_health_metrics_batch(
+    batch: HealthMetricBatchUpsert,
+    policy: MergePolicy = Query(MergePolicy.OVERWRITE, description="How to merge days that already exist"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Create or update many daily health metrics.
+
+    Days are merged with INSERT ... ON CONFLICT (user_id, date). `overwrite`
+    replaces the stored values of a day with the submitted ones and keeps
+    the metrics an entry omits, `fill_nulls` only fills values that are
+    still empty.
+    """
+    # ON CONFLICT cannot touch the same row twice, so later entries win
+    by_date = {metric.date: metric for metric in batch.metrics}
+    
+    # One statement sets the same columns for every row, so overwrites are
+    # grouped by the metrics each entry submitted
+    groups = {}
+    for metric in by_date.values():
+        if policy == MergePolicy.OVERWRITE:
+            fields = tuple(field for field in METRIC_FIELDS if field in metric.model_fields_set)
+        else:
+            fields = METRIC_FIELDS
+        row = {"id": generate_uuid(), "user_id": current_user.id, **metric.model_dump()}
+        groups.setdefault(fields, []).append(row)
+    
+    metrics = []
+    for fields, rows in groups.items():
+        for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+            stmt = upsert_insert(db, HealthMetric).values(rows[start:start + UPSERT_CHUNK_SIZE])
+            
+            if policy == MergePolicy.OVERWRITE:
+                merged = {field: stmt.excluded[field] for field in fields}
+            else:
+                merged = {
+                    field: func.coalesce(getattr(HealthMetric, field), stmt.excluded[field])
+                    for field in fields
+                }
+            merged["updated_at"] = datetime.utcnow()
+            
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["user_id", "date"],
+                set_=merged
+            ).returning(HealthMetric)
+            metrics.extend(db.scalars(stmt, execution_options={"populate_existing": True}).all())
+    
+    # Serialize before the commit expires the returned rows
+    metrics.sort(key=lambda metric: metric.date, reverse=True)
+    response = [HealthMetricResponse.model_validate(metric) for metric in metrics]
+    bump_version(db, current_user.id, HEALTH)
+    db.commit()
+    pin_primary(current_user.id)
+    
+    return response
+
+
+@router.get("/summary", response_model=HealthSummaryResponse)
+@session_handler
+def summarize_health_metrics(
+    request: Request,
+    response: Response,
+    start_date: Optional[date] = Query(None, description="Filter by start date"),
+    end_date: Optional[date] = Query(None, description="Filter by end date"),
+    bucket: SummaryBucket = Query(SummaryBucket.DAY, description="Time bucket for per-period averages"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Aggregate health metrics per time bucket.
+
+    With the day bucket every period holds exactly one logged day, so the
+    averages are that day's values.
+    """
+    not_modified = conditional_get(request, response, db, current_user.id, HEALTH)
+    if not_modified:
+        return not_modified
+    
+    filters = [HealthMetric.user_id == current_user.id]
+    if start_date:
+        filters.append(HealthMetric.date >= start_date)
+    if end_date:
+        filters.append(HealthMetric.date <= end_date)
+    
+    period = bucket_start(HealthMetric.date, bucket, db.get_bind().dialect.name).label("period")
+    periods = (
+        db.query(
+            period,
+            func.count(HealthMetric.id).label("days_logged"),
+            func.sum(HealthMetric.steps).label("total_steps"),
+            func.avg(HealthMetric.steps).label("avg_steps"),
+            func.avg(HealthMetric.weight_kg).label("avg_weight_kg"),
+            func.avg(HealthMetric.water_intake_liters).label("avg_water_intake_liters"),
+            func.avg(HealthMetric.sleep_hours).label("avg_sleep_hours"),
+            func.avg(HealthMetric.heart_rate_bpm).label("avg_heart_rate_bpm"),
+        )
+        .filter(*filters)
+        .group_by(period)
+        .order_by(period)
+        .all()
+    )
+    
+    return {"bucket": bucket, "periods": [row._asdict() for row in periods]}
+
+
+@router.get("/timeseries", response_model=TimeSeriesResponse)
+@session_handler
+def health_metric_timeseries(
+    request: Request,
+    response: Response,
+    metrics: List[HealthMetricField] = Query(list(HealthMetricField), description="Metrics to return"),
+    points: int = Query(500, ge=3, le=MAX_SERIES_POINTS, description="Maximum points per metric"),
+    method: DownsampleMethod = Query(DownsampleMethod.LTTB, description="lttb or minmax"),
+    start_date: Optional[date] = Query(None, description="Filter by start date"),
+    end_date: Optional[date] = Query(None, description="Filter by end date"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """Daily health metric series reduced to at most `points` points each.
+
+    Days without a value for a metric are skipped for that metric.
+    """
+    not_modified = conditional_get(request, response, db, current_user.id, HEALTH)
+    if not_modified:
+        return not_modified
+    
+    metrics = list(dict.fromkeys(metrics))
+    query = db.query(HealthMetric.date, *(getattr(HealthMetric, metric.value) for metric in metrics))
+    query = query.filter(HealthMetric.user_id == current_user.id)
+    if start_date:
+        query = query.filter(HealthMetric.date >= start_date)
+    if end_date:
+        query = query.filter(HealthMetric.date <= end_date)
+    rows = query.order_by(HealthMetric.date).all()
+    
+    days = [row[0] for row in rows]
+    x = np.array(days, dtype="datetime64[D]").astype(np.int64)
+    # None becomes NaN, which downsample skips
+    columns = np.array([row[1:] for row in rows], dtype=np.float64).reshape(len(rows), len(metrics))
+    
+    series = []
+    for position, metric in enumerate(metrics):
+        y = columns[:, position]
+        kept = downsample(x, y, points, method.value)
+        series.append({
+            "metric": metric,
+            "dates": [days[index] for index in kept],
+            "values": y[kept].tolist(),
+            "total_points": int(np.count_nonzero(~np.isnan(y))),
+        })
+    
+    return {"method": method, "points": points, "series": series}
+
+
+@router.get("/deleted", response_model=List[DeletedRecordResponse])
+@session_handler
+def list_deleted_health_metrics(
+    request: Request,
+    response: Response,
+    since: Optional[datetime] = Query(None, description=f"{SYNCED_AT_HEADER} watermark of the previous sync"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
+):
+    """List ids of health metrics deleted since the last sync, oldest first."""
+    not_modified = conditional_get(request, response, db, current_user.id, HEALTH)
+    if not_modified:
+        return not_modified
+    set_synced_at(response)
+    
+    return json_rows(deleted_since(db, current_user.id, HEALTH, since), response)
+
+
 @router.get("/{metric_id}", response_model=HealthMetricResponse)
+@session_handler
 def get_health_metric(
     metric_id: str,
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_read_db)
 ):
     """Get a specific health metric by ID."""
     metric = db.query(HealthMetric).filter(HealthMetric.id == metric_id).first()
@@ -111,62 +346,41 @@ def get_health_metric(
 
 
 @router.put("/{metric_id}", response_model=HealthMetricResponse)
+@session_handler
 def update_health_metric(
     metric_id: str,
     update_data: HealthMetricUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Update a health metric."""
-    metric = db.query(HealthMetric).filter(HealthMetric.id == metric_id).first()
-    
-    if not metric:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={"code": "RESOURCE_NOT_FOUND", "message": "Health metric not found"}
-        )
-    
-    # Check ownership
-    if metric.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={"code": "ACCESS_DENIED", "message": "You do not have access to this metric"}
-        )
-    
-    # Update fields
     update_dict = update_data.model_dump(exclude_unset=True)
-    for field, value in update_dict.items():
-        setattr(metric, field, value)
+    metric = update_owned(db, HealthMetric, metric_id, current_user.id, update_dict)
+    if metric is None:
+        raise _metric_access_error(db, metric_id)
     
+    response = HealthMetricResponse.model_validate(metric)
+    bump_version(db, current_user.id, HEALTH)
     db.commit()
-    db.refresh(metric)
+    pin_primary(current_user.id)
     
-    return metric
+    return response
 
 
 @router.delete("/{metric_id}", status_code=status.HTTP_204_NO_CONTENT)
+@session_handler
 def delete_health_metric(
     metric_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Delete a health metric."""
-    metric = db.query(HealthMetric).filter(HealthMetric.id == metric_id).first()
-    
-    if not metric:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail={"code": "RESOURCE_NOT_FOUND", "message": "Health metric not found"}
-        )
-    
-    # Check ownership
-    if metric.user_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail={"code": "ACCESS_DENIED", "message": "You do not have access to this metric"}
-        )
+    if delete_owned(db, HealthMetric, metric_id, current_user.id) is None:
+        raise _metric_access_error(db, metric_id)
     
-    db.delete(metric)
+    record_deletion(db, current_user.id, HEALTH, metric_id)
+    bump_version(db, current_user.id, HEALTH)
     db.commit()
+    pin_primary(current_user.id)
     
     return None
@@ -1,5 +1,6 @@
 """Pydantic schemas for request/response validation."""
 from datetime import date, datetime
+from enum import Enum
 from typing import Optional, List, Any
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
@@ -37,6 +38,12 @@ class TokenResponse(BaseModel):
     token_type: str = "bearer"
 
 
+class StreamTicketResponse(BaseModel):
+    """Schema for an event stream ticket."""
+    ticket: str
+    expires_in: int
+
+
 # ============== Fitness Record Schemas ==============
 
 class FitnessRecordCreate(BaseModel):
@@ -124,9 +131,155 @@ class HealthMetricResponse(BaseModel):
         from_attributes = True
 
 
+# ============== Summary Schemas ==============
+
+class SummaryBucket(str, Enum):
+    """Time bucket used to group summaries."""
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+
+
+class FitnessPeriodSummary(BaseModel):
+    """Schema for fitness totals within one time bucket."""
+    period: date
+    workout_count: int
+    total_duration_minutes: int
+    total_calories: int
+    total_distance_km: float
+    avg_duration_minutes: float
+    avg_calories: float
+
+
+class WorkoutTypeSummary(BaseModel):
+    """Schema for fitness totals of one workout type."""
+    workout_type: str
+    workout_count: int
+    total_duration_minutes: int
+    total_calories: int
+    total_distance_km: float
+    avg_duration_minutes: float
+    avg_calories: float
+
+
+class FitnessSummaryResponse(BaseModel):
+    """Schema for aggregated fitness records."""
+    bucket: SummaryBucket
+    periods: List[FitnessPeriodSummary]
+    workout_types: List[WorkoutTypeSummary]
+
+
+class HealthPeriodSummary(BaseModel):
+    """Schema for health metric averages within one time bucket."""
+    period: date
+    days_logged: int
+    total_steps: Optional[int]
+    avg_steps: Optional[float]
+    avg_weight_kg: Optional[float]
+    avg_water_intake_liters: Optional[float]
+    avg_sleep_hours: Optional[float]
+    avg_heart_rate_bpm: Optional[float]
+
+
+class HealthSummaryResponse(BaseModel):
+    """Schema for aggregated health metrics."""
+    bucket: SummaryBucket
+    periods: List[HealthPeriodSummary]
+
+
+# ============== Time Series Schemas ==============
+
+class HealthMetricField(str, Enum):
+    """Health metric column that can be charted."""
+    WEIGHT_KG = "weight_kg"
+    STEPS = "steps"
+    WATER_INTAKE_LITERS = "water_intake_liters"
+    SLEEP_HOURS = "sleep_hours"
+    HEART_RATE_BPM = "heart_rate_bpm"
+
+
+class DownsampleMethod(str, Enum):
+    """Algorithm used to reduce a series to the point budget."""
+    LTTB = "lttb"
+    MINMAX = "minmax"
+
+
+class TimeSeries(BaseModel):
+    """One metric's days with a value, downsampled."""
+    metric: HealthMetricField
+    dates: List[date]
+    values: List[float]
+    total_points: int
+
+
+class TimeSeriesResponse(BaseModel):
+    """Schema for downsampled health metric series."""
+    method: DownsampleMethod
+    points: int
+    series: List[TimeSeries]
+
+
 # ============== Common Schemas ==============
 
 class ErrorDetail(BaseModel):
     """Schema for error detail."""
     code: str
     message: str
+
+
+# ============== Batch Schemas ==============
+
+MAX_BATCH_SIZE = 1000
+
+
+class FitnessRecordBatchCreate(BaseModel):
+    """Schema for creating many fitness records in one request.
+
+    Items are validated one by one so a bad record does not reject the
+    whole batch.
+    """
+    records: List[Any] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class BatchItemResult(BaseModel):
+    """Schema for the outcome of a single batch item."""
+    index: int
+    status: str
+    id: Optional[str] = None
+    error: Optional[ErrorDetail] = None
+
+
+class FitnessRecordBatchResponse(BaseModel):
+    """Schema for batch fitness record creation response."""
+    created: int
+    failed: int
+    results: List[BatchItemResult]
+
+
+class MergePolicy(str, Enum):
+    """How a batch upsert treats values already stored for a day."""
+    OVERWRITE = "overwrite"
+    FILL_NULLS = "fill_nulls"
+
+
+class HealthMetricBatchUpsert(BaseModel):
+    """Schema for upserting many daily health metrics."""
+    metrics: List[HealthMetricCreate] = Field(..., min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+# ============== Sync Schemas ==============
+
+class DeletedRecordResponse(BaseModel):
+    """Tombstone of a deleted fitness record or health metric."""
+    id: str
+    deleted_at: datetime
+
+
+# ============== Export Schemas ==============
+
+class ExportFormat(str, Enum):
+    """File format of a history export."""
+    NDJSON = "ndjson"
+    CSV = "csv"
+    ARROW = "arrow"
+    PARQUET = "parquet"
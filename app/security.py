@@ -1,26 +1,98 @@
 """Security utilities for authentication."""
+import asyncio
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import bcrypt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
 
-from app.config import JWT_SECRET_KEY, JWT_ALGORITHM, JWT_EXPIRATION_HOURS
-from app.database import get_db
+from app.cache import TTLCache
+from app.config import (
+    JWT_SECRET_KEY, JWT_ALGORITHM, JWT_EXPIRATION_HOURS,
+    USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS, TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS,
+    BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT, EVENT_TICKET_SECONDS,
+    EVENT_TICKET_CACHE_SIZE
+)
+from app.database import db_session, get_db, run_db
 from app.models import User
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
 
+# Bearer scheme for routes that also accept a ticket as a query parameter
+optional_security = HTTPBearer(auto_error=False)
+
+# Dedicated pool for bcrypt so logins cannot starve the request threadpool
+_password_executor = ThreadPoolExecutor(
+    max_workers=PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash"
+)
+_password_slots = threading.BoundedSemaphore(PASSWORD_HASH_WORKERS + PASSWORD_HASH_QUEUE_LIMIT)
+
+
+class PasswordHashBusy(Exception):
+    """Raised when the password hashing pool and its queue are full."""
+
+
+@dataclass(frozen=True)
+class CurrentUser:
+    """Detached, read-only snapshot of the authenticated user."""
+    id: str
+    username: str
+    email: str
+    created_at: datetime
+
+
+# Authenticated users by id, saves a SELECT on every request
+user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL_SECONDS)
+
+# Verified token claims by token digest, skips repeated signature checks
+token_cache = TTLCache(TOKEN_CACHE_SIZE, TOKEN_CACHE_TTL_SECONDS)
+
+# Digests of redeemed stream tickets, kept until the tickets expire
+STREAM_TICKET_PURPOSE = "events"
+_spent_tickets = TTLCache(EVENT_TICKET_CACHE_SIZE, EVENT_TICKET_SECONDS)
+
+# Session.info key collecting users changed in the current transaction
+_STALE_USERS_KEY = "stale_user_ids"
+
+
+def invalidate_user(user_id: str) -> None:
+    """Drop a user from the authenticated user cache."""
+    user_cache.pop(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target):
+    """Evict a changed user now and again once the change is committed."""
+    invalidate_user(target.id)
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault(_STALE_USERS_KEY, set()).add(target.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session):
+    # A concurrent request may have re-cached the old row before the commit
+    for user_id in session.info.pop(_STALE_USERS_KEY, ()):
+        invalidate_user(user_id)
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt."""
     password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
     return bcrypt.hashpw(password_bytes, salt).decode('utf-8')
 
 
@@ -31,6 +103,35 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt.checkpw(password_bytes, hashed_bytes)
 
 
+def needs_rehash(hashed_password: str) -> bool:
+    """Check whether a bcrypt hash uses a cost other than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed_password.split("$")[2]) != BCRYPT_ROUNDS
+    except (IndexError, ValueError):
+        return True
+
+
+async def _run_password_job(func, *args):
+    """Run bcrypt work on the dedicated pool, failing fast when saturated."""
+    if not _password_slots.acquire(blocking=False):
+        raise PasswordHashBusy()
+    
+    # The slot is held until the job finishes, even if the request is cancelled
+    future = _password_executor.submit(func, *args)
+    future.add_done_callback(lambda _: _password_slots.release())
+    return await asyncio.wrap_future(future)
+
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password without blocking the event loop."""
+    return await _run_password_job(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password without blocking the event loop."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(user_id: UUID) -> str:
     """Create a JWT access token."""
     expire = datetime.utcnow() + timedelta(hours=JWT_EXPIRATION_HOURS)
@@ -42,34 +143,148 @@ def create_access_token(user_id: UUID) -> str:
     return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
 
 
+def create_stream_ticket(user_id: str) -> str:
+    """Create a short-lived, single-use JWT that only opens the event stream.
+
+    EventSource cannot send headers, so the ticket travels in the URL and
+    may end up in access logs; it expires within seconds and is refused as
+    an access token.
+    """
+    now = datetime.utcnow()
+    payload = {
+        "sub": str(user_id),
+        "purpose": STREAM_TICKET_PURPOSE,
+        "jti": uuid4().hex,
+        "exp": now + timedelta(seconds=EVENT_TICKET_SECONDS),
+        "iat": now
+    }
+    return jwt.encode(payload, JWT_SECRET_KEY, algorithm=JWT_ALGORITHM)
+
+
 def decode_token(token: str) -> Optional[dict]:
-    """Decode and validate a JWT token."""
+    """Decode and validate a JWT token.
+
+    Verified claims are cached by token digest until the token expires.
+    """
+    digest = hashlib.sha256(token.encode('utf-8')).digest()
+    payload = token_cache.get(digest)
+    if payload is not None:
+        if payload["exp"] > time.time():
+            return payload
+        token_cache.pop(digest)
+    
     try:
         payload = jwt.decode(token, JWT_SECRET_KEY, algorithms=[JWT_ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    exp = payload.get("exp")
+    if isinstance(exp, (int, float)):
+        token_cache.set(digest, payload, ttl=exp - time.time())
+    return payload
+
+
+def _load_user(db: Session, user_id: str) -> Optional[CurrentUser]:
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        return None
+    return CurrentUser(
+        id=user.id,
+        username=user.username,
+        email=user.email,
+        created_at=user.created_at
+    )
 
 
-def get_current_user(
+async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
-) -> User:
+) -> CurrentUser:
     """Get the current authenticated user from JWT token."""
+    return await authenticate_token(credentials.credentials, db)
+
+
+async def get_download_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> CurrentUser:
+    """Get the authenticated user of a streamed download from its JWT.
+
+    Like get_current_user, but loads the user in its own short session that
+    is closed before the response starts, so no pooled connection is held
+    while the body streams.
+    """
+    async with db_session() as db:
+        return await authenticate_token(credentials.credentials, db)
+
+
+async def get_stream_user(
+    ticket: Optional[str] = Query(None, description="Ticket from POST /events/ticket, for clients that cannot send headers (EventSource)"),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+) -> CurrentUser:
+    """Authenticate a long-lived streaming request by bearer token or stream ticket.
+
+    Access tokens are only accepted in the header. A ticket is accepted
+    once; reconnecting needs a new one. Uses its own short session, a
+    request-scoped one would hold a pooled connection for as long as the
+    stream stays open.
+    """
+    if credentials is not None:
+        token, purpose = credentials.credentials, None
+    elif ticket:
+        token, purpose = ticket, STREAM_TICKET_PURPOSE
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"code": "NOT_AUTHENTICATED", "message": "Not authenticated"},
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    
+    async with db_session() as db:
+        user = await authenticate_token(token, db, purpose)
+    
+    # Spent only once verified, so a forged or expired ticket cannot burn a real one
+    if purpose is not None:
+        _spend_ticket(ticket)
+    return user
+
+
+def _spend_ticket(ticket: str) -> None:
+    """Mark a verified stream ticket as used, raising if it already was."""
+    digest = hashlib.sha256(ticket.encode('utf-8')).digest()
+    if _spent_tickets.add(digest, True):
+        return
+    if _spent_tickets.get(digest) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={"code": "TICKET_USED", "message": "Stream ticket was already used"},
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    raise HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={"code": "SERVICE_BUSY", "message": "Too many streams opened recently, retry shortly"},
+        headers={"Retry-After": str(EVENT_TICKET_SECONDS)},
+    )
+
+
+async def authenticate_token(token: str, db: Session, purpose: Optional[str] = None) -> CurrentUser:
+    """Resolve a JWT to its user, raising 401 if invalid or expired.
+
+    `purpose` is the single-purpose claim the token must carry, None for
+    access tokens.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail={"code": "TOKEN_INVALID", "message": "Could not validate credentials"},
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    token = credentials.credentials
     payload = decode_token(token)
     
     if payload is None:
         raise credentials_exception
     
     user_id = payload.get("sub")
-    if user_id is None:
+    if user_id is None or payload.get("purpose") != purpose:
         raise credentials_exception
     
     # Check if token is expired
@@ -81,9 +296,13 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Get user from database
-    user = db.query(User).filter(User.id == user_id).first()
+    # Get user from cache, falling back to the database
+    user = user_cache.get(user_id)
     if user is None:
-        raise credentials_exception
+        user = await run_db(db, _load_user, user_id)
+        if user is None:
+            raise credentials_exception
+        
+        user_cache.set(user_id, user)
     
     return user
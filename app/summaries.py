@@ -0,0 +1,21 @@
+"""SQL helpers for server-side aggregation of records into time buckets."""
+from sqlalchemy import Date, cast, func, type_coerce
+
+from app.schemas import SummaryBucket
+
+
+def bucket_start(column, bucket: SummaryBucket, dialect: str):
+    """Return an expression truncating a date column to the start of its bucket.
+
+    Weeks start on Monday on every backend.
+    """
+    if bucket == SummaryBucket.DAY:
+        return column
+    
+    if dialect == "postgresql":
+        return cast(func.date_trunc(bucket.value, column), Date)
+    
+    # SQLite stores dates as ISO strings, coerce the result back to Date
+    if bucket == SummaryBucket.WEEK:
+        return type_coerce(func.date(column, "weekday 0", "-6 days"), Date)
+    return type_coerce(func.strftime("%Y-%m-01", column), Date)
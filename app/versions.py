@@ -0,0 +1,100 @@
+"""Per-user data versions backing ETags and conditional GETs.
+
+Every write to a resource bumps the user's version counter for it in the
+same transaction. List and summary endpoints derive their ETag from that
+counter and the query string, so an unchanged result is answered with 304
+after one primary key lookup instead of the full query. Once the
+transaction commits, a change event goes out to the user's event streams.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.database import upsert_insert
+from app.models import DataVersion
+from app.pubsub import hub
+
+# Versioned resources
+FITNESS = "fitness"
+HEALTH = "health"
+
+# Clients may keep responses but must revalidate them
+CACHE_CONTROL = "private, no-cache"
+
+# Session.info key collecting (user_id, resource) pairs bumped in the current transaction
+_CHANGED_KEY = "changed_resources"
+
+
+def bump_version(db: Session, user_id: str, resource: str) -> None:
+    """Increment the user's version of `resource`. The caller commits."""
+    stmt = upsert_insert(db, DataVersion).values(user_id=user_id, resource=resource, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id", "resource"],
+        set_={"version": DataVersion.version + 1}
+    )
+    db.execute(stmt)
+    db.info.setdefault(_CHANGED_KEY, set()).add((user_id, resource))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_changes(session):
+    # Subscribers refetch on the event, so it must not arrive before the data is visible
+    for user_id, resource in session.info.pop(_CHANGED_KEY, ()):
+        hub.publish(user_id, {"type": "change", "resource": resource})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back_changes(session):
+    session.info.pop(_CHANGED_KEY, None)
+
+
+def current_version(db: Session, user_id: str, resource: str) -> int:
+    """Return the user's version of `resource`, 0 if never written."""
+    version = db.execute(
+        select(DataVersion.version).where(
+            DataVersion.user_id == user_id,
+            DataVersion.resource == resource
+        )
+    ).scalar()
+    return version or 0
+
+
+def make_etag(user_id: str, resource: str, version: int, request: Request) -> str:
+    """Build a strong ETag for one user's view of `resource` at `version`."""
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    digest = hashlib.sha1(f"{user_id}|{resource}|{request.url.path}?{query}".encode("utf-8")).hexdigest()
+    return f'"{version}-{digest[:16]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an If-None-Match header against `etag` (weak comparison)."""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def conditional_get(
+    request: Request, response: Response, db: Session, user_id: str, resource: str
+) -> Optional[Response]:
+    """Return a 304 response if the client's copy is current.
+
+    Otherwise set the ETag on `response` and return None so the handler
+    runs its query.
+    """
+    etag = make_etag(user_id, resource, current_version(db, user_id, resource), request)
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        )
+
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
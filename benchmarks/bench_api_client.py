@@ -0,0 +1,85 @@
+"""Benchmark a dashboard refresh: fresh connections vs the pooled session, sequential vs fetch_many.
+
+Starts the API under uvicorn and times the syncs one dashboard refresh
+makes, with the local copies cleared so every call transfers the full
+history.
+
+Usage:
+    python benchmarks/bench_api_client.py [refreshes]
+"""
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import database_name, register_user, run_server, timed
+
+import httpx
+import requests
+
+PORT = 8765
+SEED_DAYS = 365
+
+
+def seed(base_url):
+    """Create a user with a year of fitness and health data and return its token."""
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        _, headers = register_user(client)
+        start = date(2024, 1, 1)
+        days = [(start + timedelta(days=i)).isoformat() for i in range(SEED_DAYS)]
+        records = [
+            {"date": day, "workout_type": "running", "duration_minutes": 30, "calories_burned": 300}
+            for day in days
+        ]
+        client.post("/fitness-records/batch", json={"records": records}, headers=headers).raise_for_status()
+        metrics = [{"date": day, "steps": 8000, "weight_kg": 80.0, "sleep_hours": 7.5} for day in days]
+        client.put("/health-metrics/batch", json={"metrics": metrics}, headers=headers).raise_for_status()
+    return headers["Authorization"].split(" ", 1)[1]
+
+
+def refresh_calls(client):
+    """The requests load_dashboard_data makes, as zero-argument callables."""
+    return {
+        "fitness": client.sync_fitness_records,
+        "health": client.sync_health_metrics,
+    }
+
+
+def main():
+    from dashboard import api_client
+    from dashboard.api_client import APIClient
+    
+    refreshes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    
+    def unpooled_request(method, url, **kwargs):
+        # What the client did before: module-level requests, a new connection per call
+        return requests.request(method, url, **kwargs)
+    
+    def refresh(client, concurrent):
+        api_client._synced.clear()
+        calls = refresh_calls(client)
+        if concurrent:
+            client.fetch_many(**calls)
+        else:
+            for call in calls.values():
+                call()
+    
+    print(f"database: {database_name()}")
+    print(f"{'transport':>10} {'fetch':>11} {'ms/refresh':>11}")
+    with run_server(PORT) as base_url:
+        client = APIClient(seed(base_url))
+        client.base_url = base_url
+        pooled_request = api_client._session.request
+        for transport in ("fresh", "pooled"):
+            api_client._session.request = unpooled_request if transport == "fresh" else pooled_request
+            for concurrent in (False, True):
+                refresh(client, concurrent)
+                elapsed = timed(refresh, client, concurrent, repeat=refreshes)
+                label = "fetch_many" if concurrent else "sequential"
+                print(f"{transport:>10} {label:>11} {elapsed * 1000:>11.1f}")
+        api_client._session.request = pooled_request
+
+
+if __name__ == "__main__":
+    main()
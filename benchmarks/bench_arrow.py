@@ -0,0 +1,71 @@
+"""Compare JSON, NDJSON and Arrow transfers of a full history into pandas.
+
+Runs the API under uvicorn and times download plus DataFrame construction
+for each path, reporting bytes on the wire.
+
+Usage:
+    python benchmarks/bench_arrow.py [rows]
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import database_name, insert_fitness_records, register_user, run_server
+
+import httpx
+import pandas as pd
+
+
+def json_pages(client, headers):
+    """Page through the list endpoint like the dashboard does, then build a DataFrame."""
+    records, size, params = [], 0, {"limit": 1000}
+    while True:
+        response = client.get("/fitness-records", params=params, headers=headers)
+        size += len(response.content)
+        records.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pd.DataFrame(records), size
+        params["cursor"] = cursor
+
+
+def ndjson_export(client, headers):
+    response = client.get("/export/fitness-records", params={"format": "ndjson"}, headers=headers)
+    return pd.read_json(io.BytesIO(response.content), lines=True), len(response.content)
+
+
+def arrow_export(client, headers):
+    from dashboard.api_client import APIClient
+
+    api = APIClient(headers["Authorization"].split(" ", 1)[1])
+    api.base_url = str(client.base_url).rstrip("/")
+    frame = api.get_fitness_dataframe()
+    return frame, None
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    with run_server(8769) as base_url:
+        with httpx.Client(base_url=base_url, timeout=300) as client:
+            user_id, headers = register_user(client)
+            insert_fitness_records(user_id, rows)
+
+            print(f"database: {database_name()}, rows: {rows}")
+            print(f"{'path':>12} {'seconds':>8} {'MB':>7}")
+            for name, load in (("json pages", json_pages), ("ndjson", ndjson_export), ("arrow", arrow_export)):
+                started = time.perf_counter()
+                frame, size = load(client, headers)
+                elapsed = time.perf_counter() - started
+                assert len(frame) == rows, len(frame)
+                if size is None:
+                    # Measured outside the timing, the client does not expose the payload
+                    size = len(client.get("/export/fitness-records", params={"format": "arrow"}, headers=headers).content)
+                print(f"{name:>12} {elapsed:>8.2f} {size / 1e6:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Load-test the threadpool (sync) and AsyncSession request paths.
+
+Starts the API under uvicorn once per mode against the same database, then
+fires concurrent authenticated reads and reports throughput and latency.
+
+Usage:
+    python benchmarks/bench_async.py [requests] [concurrency]
+"""
+import asyncio
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import database_name, percentile, register_user, run_server
+
+import httpx
+
+SEED_RECORDS = 500
+
+
+def seed(base_url):
+    """Create a user with some fitness records and return auth headers."""
+    with httpx.Client(base_url=base_url, timeout=30) as client:
+        _, headers = register_user(client)
+        start = date(2024, 1, 1)
+        records = [
+            {
+                "date": (start + timedelta(days=i % 365)).isoformat(),
+                "workout_type": "running",
+                "duration_minutes": 30,
+                "calories_burned": 300,
+            }
+            for i in range(SEED_RECORDS)
+        ]
+        response = client.post("/fitness-records/batch", json={"records": records}, headers=headers)
+        response.raise_for_status()
+    return headers
+
+
+async def load(base_url, headers, total, concurrency):
+    """Issue `total` GETs with `concurrency` in flight; return (elapsed, latencies)."""
+    latencies = []
+    paths = ["/fitness-records?limit=20", "/fitness-records/summary?bucket=week", "/auth/me"]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=60) as client:
+        async def worker(worker_id):
+            for i in range(worker_id, total, concurrency):
+                started = time.perf_counter()
+                response = await client.get(paths[i % len(paths)])
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code == 200, response.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return time.perf_counter() - started, sorted(latencies)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+
+    print(f"database: {database_name()}, requests: {total}, concurrency: {concurrency}")
+    print(f"{'mode':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    headers = None
+    for port, mode in ((8765, "false"), (8766, "true")):
+        with run_server(port, DATABASE_ASYNC=mode) as base_url:
+            if headers is None:
+                headers = seed(base_url)
+            asyncio.run(load(base_url, headers, concurrency, concurrency))  # warm up
+            elapsed, latencies = asyncio.run(load(base_url, headers, total, concurrency))
+        label = "async" if mode == "true" else "sync"
+        print(f"{label:>8} {total / elapsed:>8.0f} "
+              f"{percentile(latencies, 0.5) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark authentication overhead with the token and user caches on and off.
+
+Usage:
+    python benchmarks/bench_auth.py [iterations]
+"""
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import create_client, register_user, timed
+
+
+def decode_many(token, iterations):
+    from app.security import decode_token
+
+    for _ in range(iterations):
+        assert decode_token(token) is not None
+
+
+def request_many(client, headers, iterations):
+    for _ in range(iterations):
+        response = client.get("/auth/me", headers=headers)
+        assert response.status_code == 200, response.text
+
+
+def set_caches(enabled):
+    """Enable or disable the token and user caches."""
+    from app.config import TOKEN_CACHE_SIZE, USER_CACHE_SIZE
+    from app.security import token_cache, user_cache
+
+    token_cache.clear()
+    user_cache.clear()
+    token_cache.maxsize = TOKEN_CACHE_SIZE if enabled else 0
+    user_cache.maxsize = USER_CACHE_SIZE if enabled else 0
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    
+    with create_client() as client:
+        _, headers = register_user(client)
+        token = headers["Authorization"].split(" ", 1)[1]
+        
+        print(f"iterations: {iterations}")
+        print(f"{'cache':>6} {'decode_token us':>16} {'GET /auth/me us':>16}")
+        for enabled in (False, True):
+            set_caches(enabled)
+            decode = timed(decode_many, token, iterations, repeat=3) / iterations
+            request = timed(request_many, client, headers, iterations // 4, repeat=3) / (iterations // 4)
+            print(f"{'on' if enabled else 'off':>6} {decode * 1e6:>16.1f} {request * 1e6:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
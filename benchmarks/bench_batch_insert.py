@@ -0,0 +1,66 @@
+"""Benchmark single-record vs batch ingestion of fitness records.
+
+Usage:
+    python benchmarks/bench_batch_insert.py [num_records]
+"""
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import create_client, register_user, timed, database_name
+
+WORKOUT_TYPES = ["running", "cycling", "swimming", "weightlifting", "yoga", "hiit", "walking"]
+
+
+def make_records(count):
+    """Generate `count` valid fitness record payloads."""
+    today = date.today()
+    return [
+        {
+            "date": (today - timedelta(days=random.randint(0, 365))).isoformat(),
+            "workout_type": random.choice(WORKOUT_TYPES),
+            "duration_minutes": random.randint(10, 90),
+            "calories_burned": random.randint(50, 900),
+            "distance_km": round(random.uniform(0, 20), 2),
+            "intensity_level": random.choice(["low", "medium", "high"]),
+        }
+        for _ in range(count)
+    ]
+
+
+def insert_one_by_one(client, headers, records):
+    for record in records:
+        response = client.post("/fitness-records", json=record, headers=headers)
+        assert response.status_code == 201, response.text
+
+
+def insert_batch(client, headers, records, batch_size):
+    for start in range(0, len(records), batch_size):
+        chunk = records[start:start + batch_size]
+        response = client.post("/fitness-records/batch", json={"records": chunk}, headers=headers)
+        assert response.status_code == 200, response.text
+        assert response.json()["created"] == len(chunk)
+
+
+def main():
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    records = make_records(num_records)
+    
+    with create_client() as client:
+        _, headers = register_user(client)
+        
+        single = timed(insert_one_by_one, client, headers, records)
+        print(f"database: {database_name()}, records: {num_records}")
+        print(f"{'single':>12}: {num_records / single:10.0f} rows/s")
+        
+        for batch_size in (100, 500, 1000):
+            elapsed = timed(insert_batch, client, headers, records, batch_size, repeat=3)
+            rate = num_records / elapsed
+            print(f"{'batch ' + str(batch_size):>12}: {rate:10.0f} rows/s ({rate * single / num_records:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
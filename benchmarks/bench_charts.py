@@ -0,0 +1,126 @@
+"""Benchmark building the dashboard chart data: per-row lists vs typed frames, cold vs unchanged.
+
+Times the chart part of load_dashboard_data for synthetic synced copies,
+including the JSON encoding Dash applies to the stores. "rows" is the
+per-row list building the dashboard used before dashboard/charts.py,
+"frames" a first refresh through the pipeline, "unchanged" a refresh of
+equal rows under a new sync version (the frame is rebuilt and hashed, but
+nothing is sent) and "same sync" a refresh whose sync version was already
+charted, which neither builds the frame nor sends anything.
+
+Usage:
+    python benchmarks/bench_charts.py
+"""
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import timed
+
+ROW_COUNTS = (10000, 100000)
+WORKOUT_TYPES = ["running", "cycling", "swimming", "weightlifting", "yoga", "hiit", "walking"]
+
+
+def synced_records(count):
+    """Fitness records as the synced copy returns them, most recent first."""
+    start = date(2000, 1, 1)
+    records = [
+        {
+            "id": str(i),
+            "date": (start + timedelta(days=i // 3)).isoformat(),
+            "workout_type": random.choice(WORKOUT_TYPES),
+            "duration_minutes": 45,
+            "calories_burned": random.randint(50, 900),
+        }
+        for i in range(count)
+    ]
+    return records[::-1]
+
+
+def synced_metrics(count):
+    """Health metrics as the synced copy returns them, one per day, most recent first."""
+    start = date(1900, 1, 1)
+    metrics = [
+        {
+            "id": str(i),
+            "date": (start + timedelta(days=i)).isoformat(),
+            "steps": random.randint(2000, 15000),
+            "weight_kg": round(random.uniform(70, 90), 1) if i % 7 == 0 else None,
+            "sleep_hours": round(random.uniform(5, 9), 1),
+            "water_intake_liters": None,
+        }
+        for i in range(count)
+    ]
+    return metrics[::-1]
+
+
+def row_columns(records, metrics):
+    """Chart data built row by row in Python lists."""
+    epoch = date(1970, 1, 1).toordinal()
+    records = sorted(records, key=lambda record: record["date"])
+    types = sorted({record["workout_type"] for record in records})
+    codes = {workout_type: code for code, workout_type in enumerate(types)}
+    fitness = {
+        "types": types,
+        "id": [record["id"] for record in records],
+        "day": [date.fromisoformat(record["date"]).toordinal() - epoch for record in records],
+        "type": [codes[record["workout_type"]] for record in records],
+        "duration": [record["duration_minutes"] for record in records],
+        "calories": [record["calories_burned"] for record in records],
+    }
+    metrics = sorted(metrics, key=lambda metric: metric["date"])
+    health = {
+        "id": [metric["id"] for metric in metrics],
+        "day": [date.fromisoformat(metric["date"]).toordinal() - epoch for metric in metrics],
+    }
+    for name in ("steps", "weight_kg", "sleep_hours", "water_intake_liters"):
+        health[name] = [metric.get(name) for metric in metrics]
+    return fitness, health
+
+
+def main():
+    from dash._utils import to_json
+    from dashboard import charts
+    
+    def rows(records, metrics):
+        return len(to_json(row_columns(records, metrics)))
+    
+    def frames(records, metrics, held=None, version=None):
+        # What load_dashboard_data does; `held` are the hashes the browser already has
+        held = held or {}
+        sent = {}
+        fitness_key, fitness = charts.fitness_chart_data(records, version and f"fitness|{version}")
+        if fitness_key != held.get("fitness"):
+            sent["fitness"] = fitness
+        health_key, health = charts.health_chart_data(metrics, version and f"health|{version}")
+        if health_key != held.get("health"):
+            sent["health"] = health
+        return len(to_json(sent)), {"fitness": fitness_key, "health": health_key}
+    
+    def cold(records, metrics):
+        charts._payloads.clear()
+        charts._versions.clear()
+        return frames(records, metrics)[0]
+    
+    print(f"{'rows':>7} {'pipeline':>10} {'ms':>8} {'KB sent':>8}")
+    for count in ROW_COUNTS:
+        records = synced_records(count)
+        metrics = synced_metrics(count)
+        _, held = frames(records, metrics, version=count)
+        cases = (
+            ("rows", lambda: rows(records, metrics)),
+            ("frames", lambda: cold(records, metrics)),
+            ("unchanged", lambda: frames(records, metrics, held)[0]),
+            ("same sync", lambda: frames(records, metrics, held, count)[0]),
+        )
+        for label, run in cases:
+            size = run()
+            elapsed = timed(run, repeat=5)
+            print(f"{count:>7} {label:>10} {elapsed * 1000:>8.1f} {size / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark health time series size and latency, full history vs downsampled.
+
+Usage:
+    python benchmarks/bench_downsampling.py
+"""
+import math
+import os
+import random
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import create_client, database_name, register_user, timed
+
+import numpy as np
+
+YEARS = (1, 5, 10)
+# The API maximum returns every point of up to ~13 years of daily data
+POINT_BUDGETS = (500, 1000, 5000)
+BATCH = 1000
+
+
+def seed(client, headers, days):
+    start = date.today() - timedelta(days=days)
+    for offset in range(0, days, BATCH):
+        metrics = [
+            {
+                "date": (start + timedelta(days=i)).isoformat(),
+                "steps": int(8000 + 3000 * math.sin(i / 30) + random.randint(-2000, 2000)),
+                "weight_kg": round(80 - i / 500 + random.uniform(-0.5, 0.5), 1),
+                "sleep_hours": round(random.uniform(5, 9), 1),
+                "water_intake_liters": round(random.uniform(1, 3), 1),
+            }
+            for i in range(offset, min(offset + BATCH, days))
+        ]
+        response = client.put("/health-metrics/batch", json={"metrics": metrics}, headers=headers)
+        response.raise_for_status()
+
+
+def fetch(client, headers, points):
+    response = client.get("/health-metrics/timeseries", params={"points": points}, headers=headers)
+    response.raise_for_status()
+    return len(response.content)
+
+
+def main():
+    from app.downsampling import downsample
+    
+    print(f"database: {database_name()}")
+    print(f"{'days':>6} {'points':>7} {'ms':>7} {'KB':>8}")
+    with create_client() as client:
+        for years in YEARS:
+            _, headers = register_user(client)
+            days = years * 365
+            seed(client, headers, days)
+            for points in POINT_BUDGETS:
+                size = fetch(client, headers, points)
+                elapsed = timed(lambda: fetch(client, headers, points), repeat=10)
+                print(f"{days:>6} {points:>7} {elapsed * 1000:>7.1f} {size / 1024:>8.1f}")
+    
+    print()
+    print(f"{'points in':>10} {'method':>7} {'ms':>7}")
+    for n in (10000, 100000, 1000000):
+        x = np.arange(n, dtype=np.int64)
+        y = np.cumsum(np.random.standard_normal(n))
+        for method in ("lttb", "minmax"):
+            elapsed = timed(lambda: downsample(x, y, 1000, method), repeat=5)
+            print(f"{n:>10} {method:>7} {elapsed * 1000:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
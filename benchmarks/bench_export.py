@@ -0,0 +1,84 @@
+"""Benchmark streaming export memory and time to first byte against history size.
+
+Drives the export generator directly under tracemalloc, next to loading the
+same history as ORM objects the way paging through the list endpoint does.
+
+Usage:
+    python benchmarks/bench_export.py
+"""
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import create_client, database_name, insert_fitness_records, register_user
+
+HISTORY_SIZES = (10000, 50000, 100000)
+
+
+def measure_export(user_id, export_format):
+    """Return (time to first chunk, total time, bytes, peak traced memory)."""
+    from app.models import FitnessRecord
+    from app.routers.export import _stream_export
+    from app.schemas import FitnessRecordResponse
+
+    async def consume(response):
+        first_chunk = None
+        size = 0
+        async for chunk in response.body_iterator:
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+            size += len(chunk)
+        return first_chunk, size
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = _stream_export(FitnessRecord, FitnessRecordResponse, user_id, None, None, export_format, False)
+    first_chunk, size = asyncio.run(consume(response))
+    total = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return first_chunk, total, size, peak
+
+
+def measure_orm_load(user_id):
+    """Return (total time, peak traced memory) of loading every ORM object."""
+    from app.database import SessionLocal
+    from app.models import FitnessRecord
+
+    tracemalloc.start()
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        records = db.query(FitnessRecord).filter(FitnessRecord.user_id == user_id).all()
+        assert records
+    finally:
+        db.close()
+    total = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return total, peak
+
+
+def main():
+    from app.schemas import ExportFormat
+
+    print(f"database: {database_name()}")
+    print(f"{'rows':>7} {'format':>7} {'ttfb ms':>8} {'total ms':>9} {'MB out':>7} "
+          f"{'peak MB':>8} {'orm load peak MB':>17}")
+    with create_client() as client:
+        for count in HISTORY_SIZES:
+            user_id, _ = register_user(client)
+            insert_fitness_records(user_id, count)
+            _, orm_peak = measure_orm_load(user_id)
+            for export_format in (ExportFormat.NDJSON, ExportFormat.CSV):
+                first_chunk, total, size, peak = measure_export(user_id, export_format)
+                print(f"{count:>7} {export_format.value:>7} {first_chunk * 1000:>8.1f} {total * 1000:>9.0f} "
+                      f"{size / 1e6:>7.1f} {peak / 1e6:>8.1f} {orm_peak / 1e6:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
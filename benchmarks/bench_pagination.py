@@ -0,0 +1,94 @@
+"""Benchmark offset vs cursor pagination latency at increasing page depth.
+
+Usage:
+    python benchmarks/bench_pagination.py [num_records]
+"""
+import sys
+import os
+import random
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import create_client, register_user, timed, database_name
+
+PAGE_SIZE = 100
+
+
+def seed_records(user_id, count):
+    """Insert `count` fitness records for a user directly through the ORM layer."""
+    from sqlalchemy import insert
+    from app.database import SessionLocal
+    from app.models import FitnessRecord, generate_uuid
+
+    today = date.today()
+    rows = [
+        {
+            "id": generate_uuid(),
+            "user_id": user_id,
+            "date": today - timedelta(days=random.randint(0, 3650)),
+            "workout_type": "running",
+            "duration_minutes": random.randint(10, 90),
+            "calories_burned": random.randint(50, 900),
+        }
+        for _ in range(count)
+    ]
+    db = SessionLocal()
+    try:
+        for start in range(0, count, 10000):
+            db.execute(insert(FitnessRecord), rows[start:start + 10000])
+        db.commit()
+    finally:
+        db.close()
+
+
+def cursor_at(user_id, offset):
+    """Return the cursor that starts a page at `offset`."""
+    from app.database import SessionLocal
+    from app.models import FitnessRecord
+    from app.pagination import encode_cursor
+
+    db = SessionLocal()
+    try:
+        row = (
+            db.query(FitnessRecord.date, FitnessRecord.id)
+            .filter(FitnessRecord.user_id == user_id)
+            .order_by(FitnessRecord.date.desc(), FitnessRecord.id.desc())
+            .offset(offset - 1)
+            .first()
+        )
+        return encode_cursor(row.date, row.id)
+    finally:
+        db.close()
+
+
+def fetch(client, headers, params):
+    response = client.get("/fitness-records", params=params, headers=headers)
+    assert response.status_code == 200, response.text
+
+
+def main():
+    num_records = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    
+    with create_client() as client:
+        user_id, headers = register_user(client)
+        seed_records(user_id, num_records)
+        print(f"database: {database_name()}, records: {num_records}, page size: {PAGE_SIZE}")
+        print(f"{'page':>8} {'offset ms':>10} {'cursor ms':>10}")
+        
+        page = 1
+        while page * PAGE_SIZE < num_records:
+            offset = (page - 1) * PAGE_SIZE
+            offset_params = {"limit": PAGE_SIZE, "offset": offset}
+            cursor_params = {"limit": PAGE_SIZE}
+            if offset:
+                cursor_params["cursor"] = cursor_at(user_id, offset)
+            
+            offset_time = timed(fetch, client, headers, offset_params, repeat=5)
+            cursor_time = timed(fetch, client, headers, cursor_params, repeat=5)
+            print(f"{page:>8} {offset_time * 1000:>10.2f} {cursor_time * 1000:>10.2f}")
+            page *= 4
+
+
+if __name__ == "__main__":
+    main()
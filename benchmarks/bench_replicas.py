@@ -0,0 +1,74 @@
+"""Benchmark concurrent cold authenticated reads with and without a read replica.
+
+Every request uses a token the API has not seen yet, so authentication
+loads the user while the read session is open. Without a replica both
+run on the request's one primary session; with one the read goes to the
+replica engine. The replica is the primary's SQLite file opened through a
+second engine, which exercises the routing but not replication lag.
+
+Usage:
+    python benchmarks/bench_replicas.py [concurrency] [pool_overflow]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import percentile, register_user, run_server
+
+import httpx
+
+PORT = 8769
+
+
+async def cold_reads(base_url, users):
+    """Send one list request per user at once; return (elapsed, latencies, failures)."""
+    latencies = []
+    failures = 0
+    limits = httpx.Limits(max_connections=len(users), max_keepalive_connections=len(users))
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def read(headers):
+            nonlocal failures
+            started = time.perf_counter()
+            response = await client.get("/fitness-records?limit=20", headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                failures += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(read(headers) for headers in users))
+        return time.perf_counter() - started, sorted(latencies), failures
+
+
+def main():
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    # No overflow leaves only the pool, the tightest setting for sessions per request
+    overflow = sys.argv[2] if len(sys.argv) > 2 else "0"
+
+    print(f"concurrency: {concurrency}, pool overflow: {overflow}")
+    print(f"{'replica':>8} {'mode':>6} {'ms':>8} {'p99 ms':>8} {'failed':>7}")
+    tmp_dir = tempfile.mkdtemp(prefix="fitness-bench-")
+    for replica in (False, True):
+        for mode in ("sync", "async"):
+            path = os.path.join(tmp_dir, f"replica-{replica}-{mode}.db")
+            env = {
+                "DATABASE_URL": f"sqlite:///{path}",
+                "DATABASE_ASYNC": "true" if mode == "async" else "false",
+                "DATABASE_REPLICA_URLS": f"sqlite:///{path}" if replica else "",
+                "SQLITE_MAX_OVERFLOW": overflow,
+            }
+            with run_server(PORT, **env) as base_url:
+                with httpx.Client(base_url=base_url, timeout=30) as client:
+                    users = [register_user(client)[1] for _ in range(concurrency)]
+                elapsed, latencies, failures = asyncio.run(cold_reads(base_url, users))
+            label = "yes" if replica else "no"
+            print(f"{label:>8} {mode:>6} {elapsed * 1000:>8.1f} "
+                  f"{percentile(latencies, 0.99) * 1000:>8.1f} {failures:>7}")
+
+
+if __name__ == "__main__":
+    main()
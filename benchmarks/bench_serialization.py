@@ -0,0 +1,85 @@
+"""Benchmark list response serialization: ORM + pydantic + json vs Core rows + orjson.
+
+The ORM path mirrors what FastAPI does for a `response_model`: validate
+every object with `from_attributes`, dump it to JSON-compatible Python and
+encode it with the stdlib json module.
+
+Usage:
+    python benchmarks/bench_serialization.py
+"""
+import json
+import os
+import sys
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import create_client, database_name, register_user, timed
+
+import orjson
+from pydantic import TypeAdapter
+
+PAGE_SIZES = (100, 1000, 10000)
+BATCH = 1000
+
+
+def seed(client, headers, count):
+    for start in range(0, count, BATCH):
+        records = [
+            {
+                "date": f"20{10 + i // 365 % 15}-01-01",
+                "workout_type": "running",
+                "duration_minutes": 30 + i % 60,
+                "calories_burned": 300,
+                "distance_km": 5.5,
+                "notes": "steady pace",
+            }
+            for i in range(start, min(start + BATCH, count))
+        ]
+        response = client.post("/fitness-records/batch", json={"records": records}, headers=headers)
+        response.raise_for_status()
+
+
+def orm_page(db, user_id, size):
+    from app.models import FitnessRecord
+    from app.schemas import FitnessRecordResponse
+
+    adapter = TypeAdapter(List[FitnessRecordResponse])
+    records = db.query(FitnessRecord).filter(FitnessRecord.user_id == user_id).limit(size).all()
+    content = adapter.dump_python(adapter.validate_python(records, from_attributes=True), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def core_page(db, user_id, size):
+    from app.models import FitnessRecord
+    from app.responses import schema_columns
+    from app.schemas import FitnessRecordResponse
+
+    columns = schema_columns(FitnessRecord, FitnessRecordResponse)
+    rows = db.query(*columns).filter(FitnessRecord.user_id == user_id).limit(size).all()
+    return orjson.dumps([row._asdict() for row in rows])
+
+
+def main():
+    from app.database import SessionLocal
+
+    with create_client() as client:
+        user_id, headers = register_user(client)
+        seed(client, headers, max(PAGE_SIZES))
+
+    print(f"database: {database_name()}")
+    print(f"{'rows':>6} {'orm+json ms':>12} {'core+orjson ms':>15} {'speedup':>8}")
+    db = SessionLocal()
+    try:
+        assert json.loads(orm_page(db, user_id, 10)) == json.loads(core_page(db, user_id, 10))
+        for size in PAGE_SIZES:
+            repeat = max(3, 10000 // size)
+            slow = timed(lambda: (orm_page(db, user_id, size), db.expunge_all()), repeat=repeat)
+            fast = timed(lambda: core_page(db, user_id, size), repeat=repeat)
+            print(f"{size:>6} {slow * 1000:>12.1f} {fast * 1000:>15.1f} {slow / fast:>7.1f}x")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Mixed read/write throughput on SQLite with the performance profile off and on.
+
+Each mode runs the API under uvicorn against its own fresh database file,
+since the WAL journal mode is persistent once set. Every worker signs in as
+its own user and the measured run uses tokens the API has not seen yet, so
+it starts with `concurrency` cold authentications at once, each holding a
+session beside the request's own.
+
+Usage:
+    python benchmarks/bench_sqlite.py [requests] [concurrency] [write_percent]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import percentile, register_user, run_server
+
+import httpx
+
+
+def fitness_record(i):
+    return {
+        "date": (date(2024, 1, 1) + timedelta(days=i % 365)).isoformat(),
+        "workout_type": "running",
+        "duration_minutes": 30,
+        "calories_burned": 300,
+    }
+
+
+async def load(base_url, users, total, concurrency, write_percent):
+    """Mix record inserts into list/summary reads, worker i as users[i]; return (elapsed, latencies)."""
+    latencies = []
+    reads = ["/fitness-records?limit=20", "/fitness-records/summary?bucket=week"]
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker(worker_id):
+            headers = users[worker_id]
+            for i in range(worker_id, total, concurrency):
+                started = time.perf_counter()
+                # Writes are spread out, so the first wave is mostly cold authenticated reads
+                if i * 7 % 100 < write_percent:
+                    response = await client.post("/fitness-records", json=fitness_record(i), headers=headers)
+                else:
+                    response = await client.get(reads[i % len(reads)], headers=headers)
+                latencies.append(time.perf_counter() - started)
+                assert response.status_code < 300, response.text
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        return time.perf_counter() - started, sorted(latencies)
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    write_percent = int(sys.argv[3]) if len(sys.argv) > 3 else 30
+
+    print(f"requests: {total}, concurrency: {concurrency}, writes: {write_percent}%")
+    print(f"{'profile':>8} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    tmp_dir = tempfile.mkdtemp(prefix="fitness-bench-")
+    for port, enabled in ((8767, "false"), (8768, "true")):
+        url = f"sqlite:///{os.path.join(tmp_dir, f'profile-{enabled}.db')}"
+        with run_server(port, DATABASE_URL=url, SQLITE_PERFORMANCE=enabled) as base_url:
+            with httpx.Client(base_url=base_url, timeout=30) as client:
+                warm_users = [register_user(client)[1] for _ in range(concurrency)]
+                cold_users = [register_user(client)[1] for _ in range(concurrency)]
+            asyncio.run(load(base_url, warm_users, concurrency, concurrency, write_percent))  # warm up
+            elapsed, latencies = asyncio.run(load(base_url, cold_users, total, concurrency, write_percent))
+        label = "on" if enabled == "true" else "off"
+        print(f"{label:>8} {total / elapsed:>8.0f} "
+              f"{percentile(latencies, 0.5) * 1000:>8.1f} {percentile(latencies, 0.99) * 1000:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
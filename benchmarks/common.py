@@ -0,0 +1,126 @@
+"""Shared helpers for the benchmark scripts.
+
+Benchmarks run against ``DATABASE_URL`` when it is set (e.g. a Postgres
+instance) and against a throwaway SQLite file otherwise, so the development
+database is never touched.
+"""
+import contextlib
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+import uuid
+from datetime import date, datetime, timedelta
+from statistics import median
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+if "DATABASE_URL" not in os.environ:
+    _tmp_dir = tempfile.mkdtemp(prefix="fitness-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+
+def create_client():
+    """Create a test client for the API."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    return TestClient(app)
+
+
+def register_user(client):
+    """Register a throwaway user and return (user_id, auth headers)."""
+    suffix = uuid.uuid4().hex[:10]
+    username = f"bench_{suffix}"
+    password = "benchmark"
+    response = client.post(
+        "/auth/register",
+        json={"username": username, "email": f"{username}@example.com", "password": password}
+    )
+    response.raise_for_status()
+    user_id = response.json()["id"]
+    
+    response = client.post("/auth/login", json={"username": username, "password": password})
+    response.raise_for_status()
+    token = response.json()["access_token"]
+    return user_id, {"Authorization": f"Bearer {token}"}
+
+
+def insert_fitness_records(user_id, count):
+    """Bulk insert `count` fitness records directly, bypassing the API and rollups."""
+    from app.database import SessionLocal
+    from app.models import FitnessRecord, generate_uuid
+    from sqlalchemy import insert
+
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        rows = [
+            {
+                "id": generate_uuid(),
+                "user_id": user_id,
+                "date": date(2000, 1, 1) + timedelta(days=i // 3),
+                "workout_type": "running",
+                "duration_minutes": 30,
+                "calories_burned": 300,
+                "distance_km": 5.0,
+                "intensity_level": "medium",
+                "notes": "steady pace",
+                "created_at": now,
+                "updated_at": now,
+            }
+            for i in range(count)
+        ]
+        db.execute(insert(FitnessRecord), rows)
+        db.commit()
+    finally:
+        db.close()
+
+
+def timed(func, *args, repeat=1, **kwargs):
+    """Run func `repeat` times and return the median wall time in seconds."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        timings.append(time.perf_counter() - start)
+    return median(timings)
+
+
+def percentile(sorted_values, fraction):
+    """Return the value at `fraction` of an ascending list."""
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def database_name():
+    """Return a short description of the benchmark database."""
+    url = os.environ["DATABASE_URL"]
+    return url.split(":", 1)[0]
+
+
+@contextlib.contextmanager
+def run_server(port, **env):
+    """Run the API under uvicorn in a subprocess with extra environment variables."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=root,
+        env={**os.environ, **env},
+    )
+    try:
+        base_url = f"http://127.0.0.1:{port}"
+        for _ in range(100):
+            try:
+                urllib.request.urlopen(f"{base_url}/health", timeout=1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("API server did not start")
+        yield base_url
+    finally:
+        process.terminate()
+        process.wait()
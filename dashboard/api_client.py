@@ -1,9 +1,92 @@
 """API client for communicating with FastAPI backend."""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+
+import pandas as pd
+import pyarrow as pa
 import requests
-from typing import Optional, Dict, Any, List
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, Callable, Iterator, List, NamedTuple, Tuple
+from urllib3.util.retry import Retry
+
+from app.config import (
+    API_POOL_SIZE, API_CONNECT_TIMEOUT_SECONDS, API_READ_TIMEOUT_SECONDS, API_RETRIES, API_FETCH_WORKERS
+)
+from app.pagination import NEXT_CURSOR_HEADER
+from dashboard.cache import response_cache
 
 API_BASE_URL = "http://localhost:8000"
 
+# Last ETag, body and next cursor per (token, path, params), shared by all client instances
+ETAG_CACHE_SIZE = 256
+_etag_cache = OrderedDict()
+_etag_lock = threading.Lock()
+
+# Delta-synced local copies per (token, path): rows by id, watermark and ETag of the last sync
+SYNC_CACHE_SIZE = 64
+SYNC_PAGE_SIZE = 1000
+_synced = OrderedDict()
+_synced_lock = threading.Lock()
+
+# Threads running fetch_many calls, shared by all callbacks
+_fetch_executor = ThreadPoolExecutor(max_workers=API_FETCH_WORKERS, thread_name_prefix="api-fetch")
+
+# Rows per page of the paginating iterators, the largest `limit` the API accepts
+PAGE_SIZE = 1000
+
+# Threads prefetching the next page; separate from _fetch_executor so an
+# iterator consumed inside fetch_many cannot wait on a queued prefetch
+_prefetch_executor = ThreadPoolExecutor(max_workers=API_FETCH_WORKERS, thread_name_prefix="api-prefetch")
+
+# Column types of the DataFrame chunks built from list pages
+FITNESS_DTYPES = {
+    "workout_type": "category",
+    "duration_minutes": "int32",
+    "calories_burned": "int32",
+    "distance_km": "float32",
+    "intensity_level": "category",
+}
+HEALTH_DTYPES = {
+    "weight_kg": "float32",
+    "steps": "Int32",
+    "water_intake_liters": "float32",
+    "sleep_hours": "float32",
+    "heart_rate_bpm": "Int16",
+}
+
+
+class SyncedRows(NamedTuple):
+    """A delta-synced copy, most recent first.
+    
+    `version` changes whenever the rows do and is unique per user and
+    resource, so it can key anything derived from them.
+    """
+    rows: List[Dict[str, Any]]
+    version: str
+
+
+def _make_session() -> requests.Session:
+    """Session keeping up to API_POOL_SIZE connections to the API alive."""
+    # Connection failures are retried for every method, error statuses only for idempotent ones
+    retry = Retry(
+        total=API_RETRIES,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}),
+        raise_on_status=False
+    )
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=API_POOL_SIZE, pool_block=True, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# One pooled session for all clients; the API sets no cookies, so nothing mutable is shared
+_session = _make_session()
+
 
 class APIClient:
     """Client for interacting with the Fitness Tracker API."""
@@ -11,6 +94,11 @@ class APIClient:
     def __init__(self, token: Optional[str] = None):
         self.token = token
         self.base_url = API_BASE_URL
+        # Requests sent, 304 answers and response cache hits of this client, for instrumentation
+        self.api_calls = 0
+        self.not_modified = 0
+        self.cache_hits = 0
+        self._counter_lock = threading.Lock()
     
     def _headers(self) -> Dict[str, str]:
         """Get request headers with auth token if available."""
@@ -19,6 +107,26 @@ class APIClient:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
     
+    def _request(self, method: str, path: str, headers: Optional[Dict[str, str]] = None, **kwargs) -> requests.Response:
+        """Send a request to the API over the pooled session, counting it."""
+        response = _session.request(
+            method, f"{self.base_url}{path}", headers=headers or self._headers(),
+            timeout=(API_CONNECT_TIMEOUT_SECONDS, API_READ_TIMEOUT_SECONDS), **kwargs
+        )
+        with self._counter_lock:
+            self.api_calls += 1
+            if response.status_code == 304:
+                self.not_modified += 1
+        return response
+    
+    def fetch_many(self, **calls: Callable[[], Any]) -> Dict[str, Any]:
+        """Run independent API calls concurrently and return their results by name.
+        
+        Total latency is that of the slowest call rather than the sum.
+        """
+        futures = {name: _fetch_executor.submit(call) for name, call in calls.items()}
+        return {name: future.result() for name, future in futures.items()}
+    
     def _handle_response(self, response: requests.Response) -> Dict[str, Any]:
         """Handle API response and errors."""
         if response.status_code >= 400:
@@ -29,19 +137,217 @@ class APIClient:
                 return {"error": True, "detail": response.text}
         return response.json()
     
+    def _get_page(self, path: str, params: Dict[str, Any]) -> Optional[Tuple[Any, Optional[str]]]:
+        """GET `path` from the response cache, else revalidate the last response with If-None-Match.
+        
+        Returns the body and the next page cursor, None if the request failed.
+        A 304 does not repeat the cursor header, so it is cached with the body.
+        """
+        # Keyed before the request, so a write during it orphans what is stored
+        cache_key = response_cache.key(self.token, path, params) if response_cache is not None else None
+        if cache_key is not None:
+            page = response_cache.get(self.token, cache_key)
+            if page is not None:
+                with self._counter_lock:
+                    self.cache_hits += 1
+                return page[0], page[1]
+        
+        key = (self.token, path, tuple(sorted(params.items())))
+        headers = self._headers()
+        with _etag_lock:
+            cached = _etag_cache.get(key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+        
+        response = self._request("GET", path, headers=headers, params=params)
+        if response.status_code == 304 and cached:
+            data, next_cursor = cached[1], cached[2]
+        elif response.status_code != 200:
+            return None
+        else:
+            data = response.json()
+            next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            etag = response.headers.get("ETag")
+            if etag:
+                with _etag_lock:
+                    _etag_cache[key] = (etag, data, next_cursor)
+                    _etag_cache.move_to_end(key)
+                    while len(_etag_cache) > ETAG_CACHE_SIZE:
+                        _etag_cache.popitem(last=False)
+        
+        if cache_key is not None:
+            response_cache.set(self.token, cache_key, [data, next_cursor])
+        return data, next_cursor
+    
+    def _get_conditional(self, path: str, params: Dict[str, Any], default: Any) -> Any:
+        """GET the body of `path` through the caches, `default` if the request failed."""
+        page = self._get_page(path, params)
+        return default if page is None else page[0]
+    
+    def invalidate_cache(self, resource: str) -> None:
+        """Drop the user's cached responses for `resource` ("fitness" or "health")."""
+        if response_cache is not None:
+            response_cache.invalidate(self.token, resource)
+    
+    def _written(self, resource: str) -> None:
+        """Invalidate `resource` after the API accepted a write from this client."""
+        if response_cache is not None:
+            # The token was just accepted, so its user is known even without a prior read
+            response_cache.remember(self.token)
+            response_cache.invalidate(self.token, resource)
+    
+    def _sync(self, path: str) -> Optional[SyncedRows]:
+        """Bring the local copy of a list endpoint up to date and return it, most recent first.
+        
+        Only rows written or deleted since the last sync are transferred. The
+        watermark only advances when something changed, so an idle resource
+        keeps requesting the same URL and costs one 304. If the sync fails the
+        last synced copy is returned unchanged, None if there is none yet.
+        """
+        key = (self.token, path)
+        with _synced_lock:
+            state = _synced.get(key)
+        
+        try:
+            synced = self._synced_state(path, state)
+        except requests.RequestException:
+            synced = None
+        if synced is None:
+            return state["copy"] if state else None
+        
+        if synced is not state:
+            with _synced_lock:
+                _synced[key] = synced
+                _synced.move_to_end(key)
+                while len(_synced) > SYNC_CACHE_SIZE:
+                    _synced.popitem(last=False)
+        return synced["copy"]
+    
+    def _synced_state(self, path: str, state: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Fetch what changed since `state` and return the new state, `state` itself if nothing did.
+        
+        Returns None if the first request failed, so a partial sync is never
+        kept; a failed later page raises requests.HTTPError.
+        """
+        rows = dict(state["rows"]) if state else {}
+        watermark = state["watermark"] if state else None
+        
+        params = {"limit": SYNC_PAGE_SIZE}
+        headers = self._headers()
+        if watermark:
+            params["changed_since"] = watermark
+            headers["If-None-Match"] = state["etag"]
+        
+        response = self._request("GET", path, headers=headers, params=params)
+        if response.status_code == 304 and state:
+            return state
+        if response.status_code != 200:
+            return None
+        
+        etag = response.headers.get("ETag", "")
+        synced_at = response.headers.get("X-Synced-At")
+        changed = response.json()
+        next_cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if next_cursor:
+            # Later pages are prefetched while the previous one is merged
+            for page in self._iter_pages(path, {**params, "cursor": next_cursor}, SYNC_PAGE_SIZE):
+                changed.extend(page)
+        
+        deleted = []
+        if watermark:
+            response = self._request("GET", f"{path}/deleted", params={"since": watermark})
+            if response.status_code == 410:
+                # Tombstones since the watermark were pruned, start over
+                return self._synced_state(path, None)
+            if response.status_code != 200:
+                return None
+            deleted = response.json()
+        
+        if watermark and not changed and not deleted:
+            # Same rows, so the same copy and version; only the ETag to revalidate moves
+            return {**state, "etag": etag}
+        for row in changed:
+            rows[row["id"]] = row
+        for tombstone in deleted:
+            rows.pop(tombstone["id"], None)
+        
+        # The ETag is per user and path, the watermark moves with every change
+        newest_first = sorted(rows.values(), key=lambda row: row["date"], reverse=True)
+        copy = SyncedRows(newest_first, f"{path}|{synced_at}|{etag}")
+        return {"rows": rows, "watermark": synced_at, "etag": etag, "copy": copy}
+    
+    def _fetch_page(self, path: str, params: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """GET one page of a list endpoint through the caches and return its rows and the next cursor."""
+        page = self._get_page(path, params)
+        if page is None:
+            raise requests.HTTPError(f"GET {path} failed")
+        return page
+    
+    def _iter_pages(
+        self, path: str, params: Dict[str, Any], page_size: int, limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Yield every page of a list endpoint, following the cursor header.
+        
+        The next page is requested in the background while the caller works
+        on the current one, so at most two pages are held at a time. Closing
+        the iterator early cancels the prefetch if it has not started yet.
+        With a `limit`, no page is requested beyond that many rows.
+        """
+        if limit is not None:
+            if limit <= 0:
+                return
+            page_size = min(page_size, limit)
+        params = {**params, "limit": page_size}
+        pending: Optional[Future] = _prefetch_executor.submit(self._fetch_page, path, params)
+        try:
+            while pending is not None:
+                rows, next_cursor = pending.result()
+                pending = None
+                if limit is not None:
+                    rows = rows[:limit]
+                    limit -= len(rows)
+                    if limit == 0:
+                        next_cursor = None
+                if next_cursor:
+                    pending = _prefetch_executor.submit(self._fetch_page, path, {**params, "cursor": next_cursor})
+                if rows:
+                    yield rows
+        finally:
+            if pending is not None:
+                pending.cancel()
+    
+    @staticmethod
+    def _page_frame(rows: List[Dict[str, Any]], dtypes: Dict[str, str]) -> pd.DataFrame:
+        """Build a compactly typed DataFrame from one page of rows."""
+        frame = pd.DataFrame.from_records(rows).drop(columns="user_id")
+        frame["date"] = pd.to_datetime(frame["date"])
+        for column in ("created_at", "updated_at"):
+            frame[column] = pd.to_datetime(frame[column])
+        return frame.astype(dtypes)
+    
+    def _get_dataframe(self, path: str, params: Dict[str, Any]) -> pd.DataFrame:
+        """Download an Arrow IPC export and wrap it in a DataFrame without copying."""
+        response = self._request("GET", path, params={**params, "format": "arrow"})
+        if response.status_code != 200:
+            return pd.DataFrame()
+        
+        table = pa.ipc.open_stream(pa.py_buffer(response.content)).read_all()
+        # Arrow-backed columns keep pointing at the downloaded buffer
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    
     # Auth endpoints
     def register(self, username: str, email: str, password: str) -> Dict[str, Any]:
         """Register a new user."""
-        response = requests.post(
-            f"{self.base_url}/auth/register",
+        response = self._request(
+            "POST", "/auth/register",
             json={"username": username, "email": email, "password": password}
         )
         return self._handle_response(response)
     
     def login(self, username: str, password: str) -> Dict[str, Any]:
         """Login and get JWT token."""
-        response = requests.post(
-            f"{self.base_url}/auth/login",
+        response = self._request(
+            "POST", "/auth/login",
             json={"username": username, "password": password}
         )
         if response.status_code == 200:
@@ -50,10 +356,7 @@ class APIClient:
     
     def get_current_user(self) -> Dict[str, Any]:
         """Get current user info."""
-        response = requests.get(
-            f"{self.base_url}/auth/me",
-            headers=self._headers()
-        )
+        response = self._request("GET", "/auth/me")
         return self._handle_response(response)
 
     
@@ -62,9 +365,29 @@ class APIClient:
         self, 
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
-        workout_type: Optional[str] = None
+        workout_type: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get fitness records with optional filters."""
+        """Get every matching fitness record, or the `limit` most recent, most recent first.
+        
+        Raises requests.HTTPError if a page fails.
+        """
+        with closing(self.iter_fitness_records(start_date, end_date, workout_type, limit=limit)) as records:
+            return list(records)
+    
+    def iter_fitness_records(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        workout_type: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield every matching fitness record, most recent first, at most `limit` of them.
+        
+        Pages are fetched as the iterator is consumed, raising
+        requests.HTTPError if one fails.
+        """
         params = {}
         if start_date:
             params["start_date"] = start_date
@@ -73,67 +396,200 @@ class APIClient:
         if workout_type:
             params["workout_type"] = workout_type
         
-        response = requests.get(
-            f"{self.base_url}/fitness-records",
-            headers=self._headers(),
-            params=params
-        )
-        if response.status_code == 200:
-            return response.json()
-        return []
+        for rows in self._iter_pages("/fitness-records", params, page_size, limit):
+            yield from rows
+    
+    def iter_fitness_frames(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        workout_type: Optional[str] = None,
+        page_size: int = PAGE_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Lazily yield every matching fitness record as one typed DataFrame per page."""
+        params = {}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        if workout_type:
+            params["workout_type"] = workout_type
+        
+        for rows in self._iter_pages("/fitness-records", params, page_size):
+            yield self._page_frame(rows, FITNESS_DTYPES)
+    
+    def get_fitness_summary(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        workout_type: Optional[str] = None,
+        bucket: str = "day"
+    ) -> Dict[str, Any]:
+        """Get fitness totals aggregated per period and per workout type."""
+        params = {"bucket": bucket}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        if workout_type:
+            params["workout_type"] = workout_type
+        
+        return self._get_conditional("/fitness-records/summary", params, {"periods": [], "workout_types": []})
+    
+    def sync_fitness_records(self) -> Optional[SyncedRows]:
+        """Get every fitness record from the local copy, pulling only changes since the last sync.
+        
+        Returns the last synced copy if the sync fails, None if there is none.
+        The copy's version is unchanged when nothing changed on the server.
+        """
+        return self._sync("/fitness-records")
+    
+    def get_fitness_dataframe(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get the complete fitness history as a DataFrame."""
+        params = {}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        
+        return self._get_dataframe("/export/fitness-records", params)
     
     def create_fitness_record(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new fitness record."""
-        response = requests.post(
-            f"{self.base_url}/fitness-records",
-            headers=self._headers(),
-            json=data
-        )
+        response = self._request("POST", "/fitness-records", json=data)
+        if response.status_code == 201:
+            self._written("fitness")
         return self._handle_response(response)
     
     def delete_fitness_record(self, record_id: str) -> bool:
         """Delete a fitness record."""
-        response = requests.delete(
-            f"{self.base_url}/fitness-records/{record_id}",
-            headers=self._headers()
-        )
-        return response.status_code == 204
+        response = self._request("DELETE", f"/fitness-records/{record_id}")
+        if response.status_code == 204:
+            self._written("fitness")
+            return True
+        return False
     
     # Health metrics endpoints
     def get_health_metrics(
         self,
         start_date: Optional[str] = None,
-        end_date: Optional[str] = None
+        end_date: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get health metrics with optional filters."""
+        """Get every matching health metric, or the `limit` most recent, most recent first.
+        
+        Raises requests.HTTPError if a page fails.
+        """
+        with closing(self.iter_health_metrics(start_date, end_date, limit=limit)) as metrics:
+            return list(metrics)
+    
+    def iter_health_metrics(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        page_size: int = PAGE_SIZE,
+        limit: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Lazily yield every matching health metric, most recent first, at most `limit` of them.
+        
+        Pages are fetched as the iterator is consumed, raising
+        requests.HTTPError if one fails.
+        """
         params = {}
         if start_date:
             params["start_date"] = start_date
         if end_date:
             params["end_date"] = end_date
         
-        response = requests.get(
-            f"{self.base_url}/health-metrics",
-            headers=self._headers(),
-            params=params
-        )
-        if response.status_code == 200:
-            return response.json()
-        return []
+        for rows in self._iter_pages("/health-metrics", params, page_size, limit):
+            yield from rows
+    
+    def iter_health_frames(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        page_size: int = PAGE_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Lazily yield every matching health metric as one typed DataFrame per page."""
+        params = {}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        
+        for rows in self._iter_pages("/health-metrics", params, page_size):
+            yield self._page_frame(rows, HEALTH_DTYPES)
+    
+    def get_health_summary(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        bucket: str = "day"
+    ) -> Dict[str, Any]:
+        """Get health metric averages aggregated per period."""
+        params = {"bucket": bucket}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        
+        return self._get_conditional("/health-metrics/summary", params, {"periods": []})
+    
+    def get_health_timeseries(
+        self,
+        metrics: List[str],
+        points: int,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        method: str = "lttb"
+    ) -> Dict[str, Any]:
+        """Get health metric series downsampled to at most `points` points each."""
+        # A tuple keeps the params hashable for the ETag cache, requests repeats the key
+        params = {"metrics": tuple(metrics), "points": points, "method": method}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        
+        return self._get_conditional("/health-metrics/timeseries", params, {"series": []})
+    
+    def sync_health_metrics(self) -> Optional[SyncedRows]:
+        """Get every health metric from the local copy, pulling only changes since the last sync.
+        
+        Returns the last synced copy if the sync fails, None if there is none.
+        The copy's version is unchanged when nothing changed on the server.
+        """
+        return self._sync("/health-metrics")
+    
+    def get_health_dataframe(
+        self,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """Get the complete health metric history as a DataFrame."""
+        params = {}
+        if start_date:
+            params["start_date"] = start_date
+        if end_date:
+            params["end_date"] = end_date
+        
+        return self._get_dataframe("/export/health-metrics", params)
     
     def create_health_metric(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new health metric."""
-        response = requests.post(
-            f"{self.base_url}/health-metrics",
-            headers=self._headers(),
-            json=data
-        )
+        response = self._request("POST", "/health-metrics", json=data)
+        if response.status_code == 201:
+            self._written("health")
         return self._handle_response(response)
     
     def delete_health_metric(self, metric_id: str) -> bool:
         """Delete a health metric."""
-        response = requests.delete(
-            f"{self.base_url}/health-metrics/{metric_id}",
-            headers=self._headers()
-        )
-        return response.status_code == 204
+        response = self._request("DELETE", f"/health-metrics/{metric_id}")
+        if response.status_code == 204:
+            self._written("health")
+            return True
+        return False
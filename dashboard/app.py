@@ -9,6 +9,8 @@ import dash
 from dash import html, dcc
 import dash_bootstrap_components as dbc
 
+from dashboard.api_client import API_BASE_URL
+
 # Create Dash app with Bootstrap theme
 app = dash.Dash(
     __name__,
@@ -24,7 +26,12 @@ app.layout = html.Div([
     dcc.Location(id='url', refresh=False),
     dcc.Store(id='auth-token', storage_type='session'),
     dcc.Store(id='user-data', storage_type='session'),
-    dcc.Interval(id='refresh-interval', interval=30000, n_intervals=0),  # 30s refresh
+    dcc.Store(id='chart-width'),  # Browser width in px, sizes the chart point budget
+    # Live updates: assets/events.js clicks these when the API reports a change
+    dcc.Store(id='events-url', data=f"{API_BASE_URL}/events"),
+    dcc.Store(id='events-status'),
+    html.Button(id='fitness-changed', n_clicks=0, style={'display': 'none'}),
+    html.Button(id='health-changed', n_clicks=0, style={'display': 'none'}),
     html.Div(id='page-content')
 ])
 
@@ -0,0 +1,309 @@
+/* Chart filtering in the browser: filter and aggregate the column-oriented history of the last refresh */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    charts: {
+        // Minimalist chart layout
+        layout: {
+            paper_bgcolor: '#ffffff',
+            plot_bgcolor: '#ffffff',
+            font: {family: 'Geist Mono, monospace', color: '#000000', size: 12},
+            margin: {l: 40, r: 40, t: 50, b: 40},
+            legend: {font: {size: 11}},
+            xaxis: {showgrid: false, showline: true, linecolor: '#e5e5e5'},
+            yaxis: {showgrid: true, gridcolor: '#f5f5f5', showline: true, linecolor: '#e5e5e5'}
+        },
+
+        // Color palette - vibrant but clean
+        colors: ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8'],
+
+        // Fallback browser width, horizontal margins and the most points a series is drawn with
+        defaultWidth: 1200,
+        margins: 80,
+        maxPoints: 5000,
+
+        // Rows shown in the recent records tables
+        tableRows: 10,
+
+        /* Workout distribution and calories per day of the records in the selected range and type */
+        fitness: function(data, startDate, endDate, workoutType) {
+            var charts = window.dash_clientside.charts;
+            if (!data) {
+                return [charts.empty(), charts.empty()];
+            }
+
+            var range = charts.range(startDate, endDate);
+            var typeCode = workoutType ? data.types.indexOf(workoutType) : -1;
+            var counts = data.types.map(function() { return 0; });
+            var days = [];
+            var calories = [];
+            // Rows are sorted by day, so a day's records are adjacent
+            for (var i = 0; i < data.day.length; i++) {
+                var day = data.day[i];
+                if (day < range[0] || day > range[1] || (workoutType && data.type[i] !== typeCode)) {
+                    continue;
+                }
+                counts[data.type[i]] += 1;
+                if (days.length && days[days.length - 1] === day) {
+                    calories[calories.length - 1] += data.calories[i];
+                } else {
+                    days.push(day);
+                    calories.push(data.calories[i]);
+                }
+            }
+
+            var labels = [];
+            var values = [];
+            counts.forEach(function(count, code) {
+                if (count) {
+                    labels.push(data.types[code]);
+                    values.push(count);
+                }
+            });
+            var pie = labels.length ? charts.figure('Workout Distribution', [{
+                type: 'pie',
+                labels: labels,
+                values: values,
+                hole: 0.4,
+                marker: {colors: charts.colors},
+                textinfo: 'percent+label',
+                textfont: {size: 11}
+            }], {showlegend: true}) : charts.empty();
+
+            var line = days.length ? charts.figure('Calories Burned', [{
+                type: 'scatter',
+                x: days.map(charts.isoDate),
+                y: calories,
+                mode: 'lines+markers',
+                line: {color: '#FF6B6B', width: 2},
+                marker: {size: 8, color: '#FF6B6B'},
+                fill: 'tozeroy',
+                fillcolor: 'rgba(255, 107, 107, 0.1)'
+            }], {showlegend: false}) : charts.empty();
+
+            return [pie, line];
+        },
+
+        /* Steps, weight, sleep and water of the metrics in the selected range, downsampled to the chart width */
+        health: function(data, startDate, endDate, width) {
+            var charts = window.dash_clientside.charts;
+            if (!data) {
+                return [charts.empty(), charts.empty(), charts.empty()];
+            }
+
+            var range = charts.range(startDate, endDate);
+            var points = Math.max(3, Math.min((width || charts.defaultWidth) - charts.margins, charts.maxPoints));
+            var series = {};
+            ['steps', 'weight_kg', 'sleep_hours', 'water_intake_liters'].forEach(function(metric) {
+                series[metric] = charts.series(data.day, data[metric], range, points);
+            });
+
+            var steps = series.steps;
+            var stepsFig = steps.x.length ? charts.figure('Daily Steps', [{
+                type: 'bar',
+                x: steps.x,
+                y: steps.y,
+                marker: {
+                    color: steps.y,
+                    colorscale: [[0, '#96CEB4'], [0.5, '#4ECDC4'], [1, '#45B7D1']],
+                    line: {width: 0}
+                }
+            }], {
+                showlegend: false,
+                shapes: [{
+                    type: 'line', xref: 'paper', x0: 0, x1: 1, yref: 'y', y0: 10000, y1: 10000,
+                    line: {dash: 'dash', color: '#FF6B6B'}
+                }],
+                annotations: [{
+                    text: 'Goal: 10K', xref: 'paper', x: 1, yref: 'y', y: 10000,
+                    xanchor: 'right', yanchor: 'bottom', showarrow: false, font: {color: '#FF6B6B'}
+                }]
+            }) : charts.empty();
+
+            var weight = series.weight_kg;
+            var weightFig = weight.x.length ? charts.figure('Weight Trend', [{
+                type: 'scatter',
+                x: weight.x,
+                y: weight.y,
+                mode: 'lines+markers',
+                line: {color: '#4ECDC4', width: 2},
+                marker: {size: 8, color: '#4ECDC4'}
+            }], {showlegend: false}) : charts.empty();
+
+            var sleep = series.sleep_hours;
+            var water = series.water_intake_liters;
+            var sleepWaterFig = (sleep.x.length || water.x.length) ? charts.figure('Sleep & Hydration', [{
+                type: 'scatter',
+                x: sleep.x,
+                y: sleep.y,
+                name: 'Sleep (hrs)',
+                fill: 'tozeroy',
+                line: {color: '#9B59B6', width: 2},
+                fillcolor: 'rgba(155, 89, 182, 0.2)'
+            }, {
+                type: 'scatter',
+                x: water.x,
+                y: water.y,
+                name: 'Water (L)',
+                fill: 'tozeroy',
+                line: {color: '#45B7D1', width: 2},
+                fillcolor: 'rgba(69, 183, 209, 0.2)'
+            }], {showlegend: true}) : charts.empty();
+
+            return [stepsFig, weightFig, sleepWaterFig];
+        },
+
+        /* Most recent fitness records in the selected range, as rows for the table */
+        recentFitness: function(data, startDate, endDate) {
+            var charts = window.dash_clientside.charts;
+            if (!data) {
+                return null;
+            }
+            return charts.recent(data.day, startDate, endDate).map(function(i) {
+                return {
+                    id: data.id[i],
+                    date: charts.isoDate(data.day[i]),
+                    workout_type: data.types[data.type[i]],
+                    duration_minutes: data.duration[i],
+                    calories_burned: data.calories[i]
+                };
+            });
+        },
+
+        /* Most recent health metrics in the selected range, as rows for the table */
+        recentHealth: function(data, startDate, endDate) {
+            var charts = window.dash_clientside.charts;
+            if (!data) {
+                return null;
+            }
+            return charts.recent(data.day, startDate, endDate).map(function(i) {
+                return {
+                    id: data.id[i],
+                    date: charts.isoDate(data.day[i]),
+                    weight_kg: data.weight_kg[i],
+                    steps: data.steps[i],
+                    sleep_hours: data.sleep_hours[i]
+                };
+            });
+        },
+
+        /* Indices of the newest tableRows rows within the range, newest first */
+        recent: function(days, startDate, endDate) {
+            var charts = window.dash_clientside.charts;
+            var range = charts.range(startDate, endDate);
+            var rows = [];
+            // Rows are sorted oldest first, so walk back from the end
+            for (var i = days.length - 1; i >= 0 && rows.length < charts.tableRows; i--) {
+                if (days[i] >= range[0] && days[i] <= range[1]) {
+                    rows.push(i);
+                }
+            }
+            return rows;
+        },
+
+        /* Logged values of one metric within the range, as ISO dates and values */
+        series: function(days, values, range, points) {
+            var x = [];
+            var y = [];
+            for (var i = 0; i < days.length; i++) {
+                if (values[i] !== null && days[i] >= range[0] && days[i] <= range[1]) {
+                    x.push(days[i]);
+                    y.push(values[i]);
+                }
+            }
+            var keep = window.dash_clientside.charts.lttb(x, y, points);
+            return {
+                x: keep.map(function(i) { return window.dash_clientside.charts.isoDate(x[i]); }),
+                y: keep.map(function(i) { return y[i]; })
+            };
+        },
+
+        /* Largest-Triangle-Three-Buckets, the same selection as app/downsampling.py */
+        lttb: function(x, y, threshold) {
+            var n = x.length;
+            var all = [];
+            if (threshold >= n || threshold < 3) {
+                for (var k = 0; k < n; k++) {
+                    all.push(k);
+                }
+                return all;
+            }
+
+            // threshold - 2 buckets over the points between the first and the last
+            var edges = [];
+            for (var e = 0; e < threshold - 1; e++) {
+                edges.push(Math.floor(1 + e * (n - 2) / (threshold - 2)));
+            }
+            var selected = [0];
+            var previous = 0;
+            for (var bucket = 0; bucket < threshold - 2; bucket++) {
+                var start = edges[bucket];
+                var end = edges[bucket + 1];
+                // Average of the next bucket, the last bucket looks ahead to the final point
+                var avgX = x[n - 1];
+                var avgY = y[n - 1];
+                if (bucket < threshold - 3) {
+                    var nextEnd = edges[bucket + 2];
+                    avgX = 0;
+                    avgY = 0;
+                    for (var j = end; j < nextEnd; j++) {
+                        avgX += x[j];
+                        avgY += y[j];
+                    }
+                    avgX /= nextEnd - end;
+                    avgY /= nextEnd - end;
+                }
+                var best = start;
+                var bestArea = -1;
+                for (var i = start; i < end; i++) {
+                    var area = Math.abs(
+                        (x[previous] - avgX) * (y[i] - y[previous]) -
+                        (x[previous] - x[i]) * (avgY - y[previous])
+                    );
+                    if (area > bestArea) {
+                        bestArea = area;
+                        best = i;
+                    }
+                }
+                selected.push(best);
+                previous = best;
+            }
+            selected.push(n - 1);
+            return selected;
+        },
+
+        /* Selected date range as inclusive day numbers, open ends unbounded */
+        range: function(startDate, endDate) {
+            var charts = window.dash_clientside.charts;
+            return [
+                startDate ? charts.dayNumber(startDate) : -Infinity,
+                endDate ? charts.dayNumber(endDate) : Infinity
+            ];
+        },
+
+        /* Days since 1970-01-01 of a YYYY-MM-DD date, matching the server's day numbers */
+        dayNumber: function(isoDate) {
+            return Math.round(Date.parse(isoDate.slice(0, 10)) / 86400000);
+        },
+
+        isoDate: function(day) {
+            return new Date(day * 86400000).toISOString().slice(0, 10);
+        },
+
+        figure: function(title, traces, extra) {
+            var layout = Object.assign({}, window.dash_clientside.charts.layout, extra);
+            layout.title = {text: title, font: {size: 14, color: '#000000'}};
+            return {data: traces, layout: layout};
+        },
+
+        /* Placeholder figure for charts without data */
+        empty: function() {
+            return {
+                data: [],
+                layout: {
+                    paper_bgcolor: '#ffffff',
+                    plot_bgcolor: '#ffffff',
+                    annotations: [{text: 'No data available', showarrow: false, font: {size: 14, color: '#888888'}}]
+                }
+            };
+        }
+    }
+});
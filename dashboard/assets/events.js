@@ -0,0 +1,99 @@
+/* Live updates: listen to the API's change event stream and refresh on events */
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    events: {
+        source: null,
+        pending: null,
+        timer: null,
+
+        // Delay before reopening a dropped stream
+        retryMs: 3000,
+
+        /* Open a stream for the logged-in user, replacing any previous one */
+        connect: function(token, url) {
+            var events = window.dash_clientside.events;
+            events.close();
+            if (!token || !url) {
+                return 'closed';
+            }
+            events.open(token, url, false);
+            return 'open';
+        },
+
+        close: function() {
+            var events = window.dash_clientside.events;
+            clearTimeout(events.timer);
+            events.timer = null;
+            events.pending = null;
+            if (events.source) {
+                events.source.close();
+                events.source = null;
+            }
+        },
+
+        /* Exchange the token for a single-use ticket and open the stream with it */
+        open: function(token, url, reconnecting) {
+            var events = window.dash_clientside.events;
+            // EventSource cannot send headers; the ticket keeps the token out of the URL
+            var pending = fetch(url + '/ticket', {method: 'POST', headers: {Authorization: 'Bearer ' + token}});
+            events.pending = pending;
+            pending.then(function(response) {
+                if (events.pending !== pending) {
+                    return;
+                }
+                if (response.status === 401) {
+                    // Expired session, the next login connects again
+                    events.pending = null;
+                    return;
+                }
+                if (!response.ok) {
+                    throw new Error(response.status);
+                }
+                return response.json().then(function(body) {
+                    if (events.pending !== pending) {
+                        return;
+                    }
+                    events.pending = null;
+                    var source = new EventSource(url + '?ticket=' + encodeURIComponent(body.ticket));
+                    source.addEventListener('change', function(event) {
+                        events.trigger(JSON.parse(event.data).resource);
+                    });
+                    source.onopen = function() {
+                        // Events sent while disconnected are lost, refetch everything
+                        if (reconnecting) {
+                            events.trigger('fitness');
+                            events.trigger('health');
+                        }
+                    };
+                    source.onerror = function() {
+                        // The ticket is spent, so reconnect with a new one instead of letting EventSource retry
+                        if (events.source === source) {
+                            events.retry(token, url);
+                        }
+                    };
+                    events.source = source;
+                });
+            }).catch(function() {
+                if (events.pending === pending) {
+                    events.retry(token, url);
+                }
+            });
+        },
+
+        retry: function(token, url) {
+            var events = window.dash_clientside.events;
+            events.close();
+            events.timer = setTimeout(function() {
+                events.timer = null;
+                events.open(token, url, true);
+            }, events.retryMs);
+        },
+
+        /* Clicking the hidden button fires the Dash callbacks listening to it */
+        trigger: function(resource) {
+            var button = document.getElementById(resource + '-changed');
+            if (button) {
+                button.click();
+            }
+        }
+    }
+});
@@ -0,0 +1,219 @@
+"""Server-side cache of API responses shared by the dashboard callbacks.
+
+Entries are keyed by user, resource, path and query parameters, so every
+tab and token of one user shares them. A token is only mapped to its user
+after the API has accepted it once, so a forged token cannot read another
+user's entries. Writes bump a per-user generation of the resource, which
+orphans its entries at once; they age out through TTL and size eviction.
+
+The in-memory backend is per process. The SQLite backend keeps entries in
+a file shared by all dashboard workers on the host.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional
+
+from jose import JWTError, jwt
+
+from app.cache import TTLCache
+from app.config import DASHBOARD_CACHE_BACKEND, DASHBOARD_CACHE_PATH, DASHBOARD_CACHE_SIZE, DASHBOARD_CACHE_TTL_SECONDS
+
+# Cached resource per API path prefix, other paths are never cached
+RESOURCES = {
+    "/fitness-records": "fitness",
+    "/health-metrics": "health",
+}
+
+# Verified tokens per process, remembered at most this long
+TOKEN_TTL_SECONDS = 3600
+
+
+class MemoryBackend:
+    """Entries in a per-process LRU cache with TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize, ttl)
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        return self.entries.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        self.entries.set(key, value)
+
+    def generation(self, scope: Hashable) -> int:
+        with self._lock:
+            return self._generations.get(scope, 0)
+
+    def bump_generation(self, scope: Hashable) -> None:
+        with self._lock:
+            self._generations[scope] = self._generations.get(scope, 0) + 1
+
+    def stats(self) -> Dict[str, int]:
+        return self.entries.stats()
+
+
+class SQLiteBackend:
+    """Entries in a SQLite file, shared by every process that opens it."""
+
+    def __init__(self, path: str, maxsize: int, ttl: float):
+        self.path = path
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        self._counter_lock = threading.Lock()
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL, used_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS ix_entries_used_at ON entries (used_at)")
+            # Generations live apart from the entries so eviction can never reset them
+            db.execute("CREATE TABLE IF NOT EXISTS generations (scope TEXT PRIMARY KEY, generation INTEGER NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread, sqlite3 connections are not shareable."""
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def get(self, key: str) -> Optional[Any]:
+        db = self._connect()
+        now = time.time()
+        row = db.execute("SELECT value, expires_at FROM entries WHERE key = ?", (key,)).fetchone()
+        if row is None or row[1] <= now:
+            with self._counter_lock:
+                self.misses += 1
+            return None
+        db.execute("UPDATE entries SET used_at = ? WHERE key = ?", (now, key))
+        with self._counter_lock:
+            self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any) -> None:
+        db = self._connect()
+        now = time.time()
+        db.execute(
+            "INSERT OR REPLACE INTO entries (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)",
+            (key, json.dumps(value), now + self.ttl, now)
+        )
+        # Drop expired entries, then the least recently used beyond maxsize
+        db.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+        db.execute(
+            "DELETE FROM entries WHERE key IN "
+            "(SELECT key FROM entries ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+            (self.maxsize,)
+        )
+
+    def generation(self, scope: Hashable) -> int:
+        row = self._connect().execute(
+            "SELECT generation FROM generations WHERE scope = ?", (repr(scope),)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def bump_generation(self, scope: Hashable) -> None:
+        self._connect().execute(
+            "INSERT INTO generations (scope, generation) VALUES (?, 1) "
+            "ON CONFLICT (scope) DO UPDATE SET generation = generation + 1",
+            (repr(scope),)
+        )
+
+    def stats(self) -> Dict[str, int]:
+        size = self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        with self._counter_lock:
+            return {"size": size, "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class ResponseCache:
+    """Per-user cache of GET responses in front of the API."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._users = TTLCache(4096, TOKEN_TTL_SECONDS)
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def user_for(self, token: Optional[str]) -> Optional[str]:
+        """Return the user of a token the API has accepted, None otherwise."""
+        return self._users.get(self._digest(token)) if token else None
+
+    def remember(self, token: str) -> None:
+        """Map a token the API just accepted to its user (the JWT `sub`)."""
+        claims = jwt.get_unverified_claims(token)
+        ttl = claims.get("exp", 0) - time.time()
+        self._users.set(self._digest(token), claims.get("sub"), ttl=ttl)
+
+    def key(self, token: Optional[str], path: str, params: Dict[str, Any]) -> Optional[str]:
+        """Entry key of a GET, None if it is not cached.
+
+        Take it before sending the request: it holds the resource's current
+        generation, so a write that lands while the request is in flight
+        orphans the entry stored for it. A token the API has not accepted yet
+        is keyed by its unverified `sub`; nothing is stored under that key
+        unless the API accepts the token, and `get` ignores unaccepted tokens.
+        """
+        resource = next((name for prefix, name in RESOURCES.items() if path.startswith(prefix)), None)
+        if resource is None or not token:
+            return None
+        user_id = self.user_for(token)
+        if user_id is None:
+            try:
+                user_id = jwt.get_unverified_claims(token).get("sub")
+            except JWTError:
+                return None
+        if user_id is None:
+            return None
+        generation = self.backend.generation((user_id, resource))
+        query = "&".join(f"{name}={value}" for name, value in sorted(params.items()))
+        return f"{user_id}|{resource}|{generation}|{path}?{query}"
+
+    def get(self, token: Optional[str], key: Optional[str]) -> Optional[Any]:
+        """Return the body cached under `key`, None on a miss or for a token the API has not accepted."""
+        if key is None or self.user_for(token) is None:
+            return None
+        return self.backend.get(key)
+
+    def set(self, token: str, key: Optional[str], value: Any) -> None:
+        """Cache a body the API returned for `token` under the key taken before the request."""
+        if key is None:
+            return
+        if self.user_for(token) is None:
+            self.remember(token)
+        self.backend.set(key, value)
+
+    def invalidate(self, token: Optional[str], resource: str) -> None:
+        """Orphan every cached response of the token's user for `resource`."""
+        user_id = self.user_for(token)
+        if user_id:
+            self.backend.bump_generation((user_id, resource))
+
+    def stats(self) -> Dict[str, int]:
+        return self.backend.stats()
+
+
+def make_backend(name: str):
+    """Build the backend named by DASHBOARD_CACHE_BACKEND, None disables caching."""
+    if name == "memory":
+        return MemoryBackend(DASHBOARD_CACHE_SIZE, DASHBOARD_CACHE_TTL_SECONDS)
+    if name == "sqlite":
+        return SQLiteBackend(os.path.abspath(DASHBOARD_CACHE_PATH), DASHBOARD_CACHE_SIZE, DASHBOARD_CACHE_TTL_SECONDS)
+    if name == "none":
+        return None
+    raise ValueError(f"Unknown dashboard cache backend: {name}")
+
+
+_backend = make_backend(DASHBOARD_CACHE_BACKEND)
+response_cache = ResponseCache(_backend) if _backend is not None else None
@@ -1,12 +1,11 @@
 """Dashboard callbacks for interactivity."""
-from dash import Input, Output, State, callback, html, no_update
+import time
+
+from dash import ClientsideFunction, Input, Output, State, callback, clientside_callback, ctx, html, no_update
 import dash_bootstrap_components as dbc
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-from datetime import date
 
 from dashboard.api_client import APIClient
+from dashboard.charts import fitness_chart_data, health_chart_data
 from dashboard.layouts import login_layout, register_layout, dashboard_layout
 
 
@@ -130,157 +129,129 @@ def update_user_display(user_data):
     return ""
 
 
-# Chart update callbacks
+# Report the browser width so charts draw no more points than they can show
+clientside_callback(
+    "function(pathname) { return window.innerWidth; }",
+    Output('chart-width', 'data'),
+    Input('url', 'pathname')
+)
+
+
+# Open the change event stream for the logged-in user, close it on logout
+clientside_callback(
+    ClientsideFunction(namespace='events', function_name='connect'),
+    Output('events-status', 'data'),
+    Input('auth-token', 'data'),
+    State('events-url', 'data')
+)
+
+
+# Data loading callback: ships the user's full history to the browser once per
+# refresh, the charts and tables are filtered and aggregated there by assets/charts.js
 @callback(
-    Output('workout-pie-chart', 'figure'),
-    Output('calories-line-chart', 'figure'),
-    Output('steps-bar-chart', 'figure'),
-    Output('weight-line-chart', 'figure'),
-    Output('sleep-water-chart', 'figure'),
+    Output('fitness-data', 'data'),
+    Output('health-data', 'data'),
+    Output('chart-hashes', 'data'),
+    Output('refresh-stats', 'children'),
     Input('refresh-button', 'n_clicks'),
-    Input('refresh-interval', 'n_intervals'),
+    Input('fitness-changed', 'n_clicks'),
+    Input('health-changed', 'n_clicks'),
     Input('auth-token', 'data'),
-    State('date-filter', 'start_date'),
-    State('date-filter', 'end_date'),
-    State('workout-type-filter', 'value')
+    State('chart-hashes', 'data')
 )
-def update_charts(n_clicks, n_intervals, token, start_date, end_date, workout_type):
-    """Update all charts with current data."""
-    # Minimalist chart layout
-    chart_layout = dict(
-        paper_bgcolor='#ffffff',
-        plot_bgcolor='#ffffff',
-        font=dict(family='Geist Mono, monospace', color='#000000', size=12),
-        margin=dict(l=40, r=40, t=50, b=40),
-        title_font=dict(size=14, color='#000000'),
-        legend=dict(font=dict(size=11))
-    )
-    
-    empty_fig = go.Figure()
-    empty_fig.update_layout(
-        paper_bgcolor='#ffffff',
-        plot_bgcolor='#ffffff',
-        annotations=[{"text": "No data available", "showarrow": False, "font": {"size": 14, "color": "#888888"}}]
-    )
-    
+def load_dashboard_data(n_clicks, fitness_changes, health_changes, token, hashes):
+    """Fetch everything the dashboard shows, once per refresh.
+
+    A change event only reloads the resource it names, the other stores
+    keep their data, as do the stores of a resource whose first sync
+    failed. Chart data is only sent when its content hash differs from the
+    one the browser holds. Date and workout type filters never come
+    through here.
+    """
     if not token:
-        return empty_fig, empty_fig, empty_fig, empty_fig, empty_fig
+        return None, None, None, ""
     
     client = APIClient(token)
-    
-    # Fetch data
-    fitness_records = client.get_fitness_records(start_date, end_date, workout_type if workout_type else None)
-    health_metrics = client.get_health_metrics(start_date, end_date)
-    
-    # Color palette - vibrant but clean
-    colors = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7', '#DDA0DD', '#98D8C8']
-    
-    # Workout distribution pie chart
-    if fitness_records:
-        df_fitness = pd.DataFrame(fitness_records)
-        workout_counts = df_fitness['workout_type'].value_counts()
-        pie_fig = go.Figure(data=[go.Pie(
-            labels=workout_counts.index,
-            values=workout_counts.values,
-            hole=0.4,
-            marker=dict(colors=colors),
-            textinfo='percent+label',
-            textfont=dict(size=11)
-        )])
-        pie_fig.update_layout(**chart_layout, title='Workout Distribution', showlegend=True)
-    else:
-        pie_fig = empty_fig
-    
-    # Calories line chart
-    if fitness_records:
-        df_fitness = pd.DataFrame(fitness_records)
-        df_fitness['date'] = pd.to_datetime(df_fitness['date'])
-        calories_by_date = df_fitness.groupby('date')['calories_burned'].sum().reset_index()
-        calories_fig = go.Figure(data=[go.Scatter(
-            x=calories_by_date['date'],
-            y=calories_by_date['calories_burned'],
-            mode='lines+markers',
-            line=dict(color='#FF6B6B', width=2),
-            marker=dict(size=8, color='#FF6B6B'),
-            fill='tozeroy',
-            fillcolor='rgba(255, 107, 107, 0.1)'
-        )])
-        calories_fig.update_layout(**chart_layout, title='Calories Burned', showlegend=False)
-        calories_fig.update_xaxes(showgrid=False, showline=True, linecolor='#e5e5e5')
-        calories_fig.update_yaxes(showgrid=True, gridcolor='#f5f5f5', showline=True, linecolor='#e5e5e5')
-    else:
-        calories_fig = empty_fig
-    
-    # Steps bar chart
-    if health_metrics:
-        df_health = pd.DataFrame(health_metrics)
-        df_health['date'] = pd.to_datetime(df_health['date'])
-        df_health = df_health.sort_values('date')
-        steps_fig = go.Figure(data=[go.Bar(
-            x=df_health['date'],
-            y=df_health['steps'],
-            marker=dict(
-                color=df_health['steps'],
-                colorscale=[[0, '#96CEB4'], [0.5, '#4ECDC4'], [1, '#45B7D1']],
-                line=dict(width=0)
-            )
-        )])
-        steps_fig.add_hline(y=10000, line_dash="dash", line_color="#FF6B6B", 
-                          annotation_text="Goal: 10K", annotation_font_color="#FF6B6B")
-        steps_fig.update_layout(**chart_layout, title='Daily Steps', showlegend=False)
-        steps_fig.update_xaxes(showgrid=False, showline=True, linecolor='#e5e5e5')
-        steps_fig.update_yaxes(showgrid=True, gridcolor='#f5f5f5', showline=True, linecolor='#e5e5e5')
-    else:
-        steps_fig = empty_fig
-    
-    # Weight trend line chart
-    if health_metrics:
-        df_health = pd.DataFrame(health_metrics)
-        df_health['date'] = pd.to_datetime(df_health['date'])
-        df_health = df_health.sort_values('date')
-        weight_fig = go.Figure(data=[go.Scatter(
-            x=df_health['date'],
-            y=df_health['weight_kg'],
-            mode='lines+markers',
-            line=dict(color='#4ECDC4', width=2),
-            marker=dict(size=8, color='#4ECDC4')
-        )])
-        weight_fig.update_layout(**chart_layout, title='Weight Trend', showlegend=False)
-        weight_fig.update_xaxes(showgrid=False, showline=True, linecolor='#e5e5e5')
-        weight_fig.update_yaxes(showgrid=True, gridcolor='#f5f5f5', showline=True, linecolor='#e5e5e5')
-    else:
-        weight_fig = empty_fig
-    
-    # Sleep & Water area chart
-    if health_metrics:
-        df_health = pd.DataFrame(health_metrics)
-        df_health['date'] = pd.to_datetime(df_health['date'])
-        df_health = df_health.sort_values('date')
-        
-        sleep_water_fig = go.Figure()
-        sleep_water_fig.add_trace(go.Scatter(
-            x=df_health['date'],
-            y=df_health['sleep_hours'],
-            name='Sleep (hrs)',
-            fill='tozeroy',
-            line=dict(color='#9B59B6', width=2),
-            fillcolor='rgba(155, 89, 182, 0.2)'
-        ))
-        sleep_water_fig.add_trace(go.Scatter(
-            x=df_health['date'],
-            y=df_health['water_intake_liters'],
-            name='Water (L)',
-            fill='tozeroy',
-            line=dict(color='#45B7D1', width=2),
-            fillcolor='rgba(69, 183, 209, 0.2)'
-        ))
-        sleep_water_fig.update_layout(**chart_layout, title='Sleep & Hydration', showlegend=True)
-        sleep_water_fig.update_xaxes(showgrid=False, showline=True, linecolor='#e5e5e5')
-        sleep_water_fig.update_yaxes(showgrid=True, gridcolor='#f5f5f5', showline=True, linecolor='#e5e5e5')
-    else:
-        sleep_water_fig = empty_fig
-    
-    return pie_fig, calories_fig, steps_fig, weight_fig, sleep_water_fig
+    started = time.perf_counter()
+    calls = {}
+    
+    # The event may come from a write in another tab or worker, cached responses are stale
+    if ctx.triggered_id == 'fitness-changed':
+        client.invalidate_cache("fitness")
+    elif ctx.triggered_id == 'health-changed':
+        client.invalidate_cache("health")
+    
+    # Local copies are delta-synced, a refresh only transfers what changed
+    if ctx.triggered_id != 'health-changed':
+        calls["fitness"] = client.sync_fitness_records
+    if ctx.triggered_id != 'fitness-changed':
+        calls["health"] = client.sync_health_metrics
+    
+    # Requests run in parallel, the refresh takes as long as the slowest one
+    results = client.fetch_many(**calls)
+    fitness_data = health_data = no_update
+    hashes = dict(hashes or {})
+    sent = []
+    failed = [name for name, rows in results.items() if rows is None]
+    if results.get("fitness") is not None:
+        key, payload = fitness_chart_data(*results["fitness"])
+        if key != hashes.get("fitness"):
+            fitness_data, hashes["fitness"] = payload, key
+            sent.append("fitness")
+    if results.get("health") is not None:
+        key, payload = health_chart_data(*results["health"])
+        if key != hashes.get("health"):
+            health_data, hashes["health"] = payload, key
+            sent.append("health")
+    
+    elapsed = (time.perf_counter() - started) * 1000
+    stats = (
+        f"{client.api_calls} api calls, {client.not_modified} not modified, "
+        f"charts sent: {', '.join(sent) or 'none'}, {elapsed:.0f} ms"
+    )
+    if failed:
+        stats += f", sync failed: {', '.join(failed)}"
+    return fitness_data, health_data, hashes, stats
+
+
+# Chart callbacks run in the browser, filter changes never reach the server
+clientside_callback(
+    ClientsideFunction(namespace='charts', function_name='fitness'),
+    Output('workout-pie-chart', 'figure'),
+    Output('calories-line-chart', 'figure'),
+    Input('fitness-data', 'data'),
+    Input('date-filter', 'start_date'),
+    Input('date-filter', 'end_date'),
+    Input('workout-type-filter', 'value')
+)
+
+clientside_callback(
+    ClientsideFunction(namespace='charts', function_name='health'),
+    Output('steps-bar-chart', 'figure'),
+    Output('weight-line-chart', 'figure'),
+    Output('sleep-water-chart', 'figure'),
+    Input('health-data', 'data'),
+    Input('date-filter', 'start_date'),
+    Input('date-filter', 'end_date'),
+    State('chart-width', 'data')
+)
+
+# The recent records tables follow the date filter the same way
+clientside_callback(
+    ClientsideFunction(namespace='charts', function_name='recentFitness'),
+    Output('fitness-recent', 'data'),
+    Input('fitness-data', 'data'),
+    Input('date-filter', 'start_date'),
+    Input('date-filter', 'end_date')
+)
+
+clientside_callback(
+    ClientsideFunction(namespace='charts', function_name='recentHealth'),
+    Output('health-recent', 'data'),
+    Input('health-data', 'data'),
+    Input('date-filter', 'start_date'),
+    Input('date-filter', 'end_date')
+)
 
 
 # Add fitness record callback
@@ -380,25 +351,15 @@ def add_health_metric(n_clicks, token, metric_date, weight, steps, water, sleep,
 # Data tables callbacks
 @callback(
     Output('fitness-records-table', 'children'),
-    Input('refresh-button', 'n_clicks'),
-    Input('refresh-interval', 'n_intervals'),
-    Input('auth-token', 'data'),
-    State('date-filter', 'start_date'),
-    State('date-filter', 'end_date')
+    Input('fitness-recent', 'data')
 )
-def update_fitness_table(n_clicks, n_intervals, token, start_date, end_date):
-    if not token:
+def update_fitness_table(records):
+    if records is None:
         return html.P("Please login to view records")
     
-    client = APIClient(token)
-    records = client.get_fitness_records(start_date, end_date)
-    
     if not records:
         return html.P("No fitness records found")
     
-    # Show only recent 10 records
-    records = records[:10]
-    
     table_header = [
         html.Thead(html.Tr([
             html.Th("Date"),
@@ -427,25 +388,15 @@ def update_fitness_table(n_clicks, n_intervals, token, start_date, end_date):
 
 @callback(
     Output('health-metrics-table', 'children'),
-    Input('refresh-button', 'n_clicks'),
-    Input('refresh-interval', 'n_intervals'),
-    Input('auth-token', 'data'),
-    State('date-filter', 'start_date'),
-    State('date-filter', 'end_date')
+    Input('health-recent', 'data')
 )
-def update_health_table(n_clicks, n_intervals, token, start_date, end_date):
-    if not token:
+def update_health_table(metrics):
+    if metrics is None:
         return html.P("Please login to view metrics")
     
-    client = APIClient(token)
-    metrics = client.get_health_metrics(start_date, end_date)
-    
     if not metrics:
         return html.P("No health metrics found")
     
-    # Show only recent 10 metrics
-    metrics = metrics[:10]
-    
     table_header = [
         html.Thead(html.Tr([
             html.Th("Date"),
@@ -0,0 +1,158 @@
+"""Chart data pipeline: typed frames built once per synced copy, memoized payloads.
+
+Synced rows are normalized into one typed DataFrame per resource, dates as
+day numbers since the Unix epoch, sorted oldest first. The five charts and
+the recent records tables are drawn by assets/charts.js from the column
+payloads derived from these frames. Payloads are memoized on a content
+hash of the frame, and a dashboard whose store already holds that hash is
+not sent the data again. The hash is remembered per sync version, so a
+refresh whose copy did not change skips building the frame altogether.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from operator import itemgetter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Health metrics drawn by the charts
+CHART_METRICS = ["steps", "weight_kg", "sleep_hours", "water_intake_liters"]
+
+# Payloads per content hash, and the content hash per sync version, shared
+# by all sessions of the dashboard process
+CHART_CACHE_SIZE = 32
+_payloads = OrderedDict()
+_versions = OrderedDict()
+_payloads_lock = threading.Lock()
+
+
+def _days(rows: List[Dict[str, Any]]) -> np.ndarray:
+    """Days since 1970-01-01 of each row's YYYY-MM-DD date, as JS counts them."""
+    return np.array(list(map(itemgetter("date"), rows)), dtype="datetime64[D]").astype(np.int32)
+
+
+def fitness_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Typed frame of the charted and tabulated fitness columns, oldest first."""
+    frame = pd.DataFrame({
+        "id": pd.Series(list(map(itemgetter("id"), records)), dtype=object),
+        "day": _days(records),
+        "workout_type": pd.Categorical(list(map(itemgetter("workout_type"), records))),
+        "duration": np.fromiter(map(itemgetter("duration_minutes"), records), dtype=np.int32, count=len(records)),
+        "calories": np.fromiter(map(itemgetter("calories_burned"), records), dtype=np.int32, count=len(records)),
+    })
+    return frame.sort_values("day", kind="stable", ignore_index=True)
+
+
+def health_frame(metrics: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Typed frame of the charted health metrics and row ids, oldest first, NaN where a metric was not logged."""
+    columns = {"id": pd.Series(list(map(itemgetter("id"), metrics)), dtype=object), "day": _days(metrics)}
+    for name in CHART_METRICS:
+        # None becomes NaN, which the browser receives as null
+        columns[name] = np.array([metric.get(name) for metric in metrics], dtype=np.float64)
+    return pd.DataFrame(columns).sort_values("day", kind="stable", ignore_index=True)
+
+
+def content_hash(frame: pd.DataFrame) -> str:
+    """Digest of a frame's column names and values.
+    
+    Hashes the raw column buffers; string columns are joined first, which
+    is several times faster than pd.util.hash_pandas_object on them.
+    """
+    digest = hashlib.blake2b(",".join(frame.columns).encode("utf-8"), digest_size=16)
+    digest.update(len(frame).to_bytes(8, "little"))
+    for name in frame.columns:
+        column = frame[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            digest.update("\x1f".join(column.cat.categories.astype(str)).encode("utf-8"))
+            column = column.cat.codes
+        if pd.api.types.is_numeric_dtype(column.dtype):
+            digest.update(column.to_numpy().tobytes())
+        else:
+            digest.update("\x1f".join(column.tolist()).encode("utf-8"))
+        digest.update(b"\x1e")
+    return digest.hexdigest()
+
+
+def fitness_payload(frame: pd.DataFrame) -> Dict[str, Any]:
+    """Columns for assets/charts.js: workout types once, then one code per row."""
+    return {
+        "types": frame["workout_type"].cat.categories.tolist(),
+        # Dash encodes a list of strings far faster than an array of them
+        "id": frame["id"].tolist(),
+        "day": frame["day"].to_numpy(),
+        "type": frame["workout_type"].cat.codes.to_numpy(),
+        "duration": frame["duration"].to_numpy(),
+        "calories": frame["calories"].to_numpy(),
+    }
+
+
+def health_payload(frame: pd.DataFrame) -> Dict[str, Any]:
+    """Columns for assets/charts.js: row ids, day numbers and one array per metric."""
+    payload = {name: frame[name].to_numpy() for name in frame.columns}
+    payload["id"] = frame["id"].tolist()
+    return payload
+
+
+def _memoized(key: str, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the payload cached under `key`, building and caching it on a miss."""
+    with _payloads_lock:
+        payload = _payloads.get(key)
+        if payload is not None:
+            _payloads.move_to_end(key)
+            return payload
+    
+    payload = build()
+    with _payloads_lock:
+        _payloads[key] = payload
+        _payloads.move_to_end(key)
+        while len(_payloads) > CHART_CACHE_SIZE:
+            _payloads.popitem(last=False)
+    return payload
+
+
+def _chart_data(
+    version: Optional[str],
+    rows: List[Dict[str, Any]],
+    make_frame: Callable[[List[Dict[str, Any]]], pd.DataFrame],
+    make_payload: Callable[[pd.DataFrame], Dict[str, Any]]
+) -> Tuple[str, Dict[str, Any]]:
+    """Return the content hash and payload of `rows`, skipping the frame if `version` was seen."""
+    if version is not None:
+        with _payloads_lock:
+            key = _versions.get(version)
+            payload = _payloads.get(key) if key is not None else None
+            if payload is not None:
+                _versions.move_to_end(version)
+                _payloads.move_to_end(key)
+                return key, payload
+    
+    frame = make_frame(rows)
+    key = content_hash(frame)
+    payload = _memoized(key, lambda: make_payload(frame))
+    if version is not None:
+        with _payloads_lock:
+            _versions[version] = key
+            _versions.move_to_end(version)
+            while len(_versions) > CHART_CACHE_SIZE:
+                _versions.popitem(last=False)
+    return key, payload
+
+
+def fitness_chart_data(records: List[Dict[str, Any]], version: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+    """Normalize fitness records once and return their content hash and chart payload.
+    
+    `version` is the sync version of the records (SyncedRows.version), None
+    to always build the frame.
+    """
+    return _chart_data(version, records, fitness_frame, fitness_payload)
+
+
+def health_chart_data(metrics: List[Dict[str, Any]], version: Optional[str] = None) -> Tuple[str, Dict[str, Any]]:
+    """Normalize health metrics once and return their content hash and chart payload.
+    
+    `version` is the sync version of the metrics (SyncedRows.version), None
+    to always build the frame.
+    """
+    return _chart_data(version, metrics, health_frame, health_payload)
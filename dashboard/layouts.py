@@ -169,13 +169,21 @@ def dashboard_layout():
                             dbc.Col([
                                 html.Label(" ", style={'display': 'block'}),
                                 dbc.Button("refresh", id="refresh-button", color="primary",
-                                          style={'width': '100%', 'marginTop': '0.25rem'})
+                                          style={'width': '100%', 'marginTop': '0.25rem'}),
+                                html.Small(id="refresh-stats", style={'color': '#888888', 'fontSize': '0.7rem'})
                             ], width=3)
                         ])
                     ], style={'padding': '1rem'})
                 ], style={'marginBottom': '1.5rem'})
             ]),
             
+            # Column-oriented history for the clientside charts, and the table rows picked from it
+            dcc.Store(id="fitness-data"),
+            dcc.Store(id="health-data"),
+            dcc.Store(id="fitness-recent"),
+            dcc.Store(id="health-recent"),
+            dcc.Store(id="chart-hashes"),  # Content hashes of the chart data the browser holds
+            
             # Charts Row 1
             dbc.Row([
                 dbc.Col([
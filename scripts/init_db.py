@@ -5,8 +5,9 @@ import os
 # Add parent directory to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.database import engine, Base
-from app.models import User, FitnessRecord, HealthMetric
+from app.database import engine, Base, SessionLocal
+from app.models import User, FitnessRecord, HealthMetric, DailyRollup
+from app.rollups import rebuild_rollups
 
 
 def init_database():
@@ -14,6 +15,15 @@ def init_database():
     print("Creating database tables...")
     Base.metadata.create_all(bind=engine)
     print("Database tables created successfully!")
+    
+    # Backfill rollups for records created before the table existed
+    db = SessionLocal()
+    try:
+        count = rebuild_rollups(db)
+        db.commit()
+        print(f"Rebuilt {count} daily rollups")
+    finally:
+        db.close()
 
 
 if __name__ == "__main__":
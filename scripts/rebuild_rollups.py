@@ -0,0 +1,44 @@
+"""Rebuild the daily rollup table from fitness records.
+
+Usage:
+    python scripts/rebuild_rollups.py [username]
+"""
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import SessionLocal
+from app.models import User
+from app.rollups import rebuild_rollups
+
+
+def rebuild(username=None):
+    """Rebuild rollups for one user, or for everyone when no username is given."""
+    db = SessionLocal()
+    
+    try:
+        user_id = None
+        if username:
+            user = db.query(User).filter(User.username == username).first()
+            if not user:
+                print(f"User '{username}' not found")
+                return
+            user_id = user.id
+        
+        print("Rebuilding daily rollups...")
+        count = rebuild_rollups(db, user_id)
+        db.commit()
+        print(f"Rebuilt {count} daily rollups")
+        
+    except Exception as e:
+        db.rollback()
+        print(f"Error rebuilding rollups: {e}")
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    rebuild(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -9,6 +9,7 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.database import SessionLocal
 from app.models import User, FitnessRecord, HealthMetric
+from app.rollups import rebuild_rollups
 from app.security import hash_password
 
 
@@ -149,6 +150,8 @@ def seed_database():
         print("Generating fitness records...")
         fitness_records = generate_fitness_records(demo_user.id, num_records=30)
         db.add_all(fitness_records)
+        db.flush()
+        rebuild_rollups(db, demo_user.id)
         db.commit()
         print(f"Created {len(fitness_records)} fitness records")
         
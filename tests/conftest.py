@@ -0,0 +1,88 @@
+"""Shared fixtures: the API on a throwaway SQLite database, served in process."""
+import os
+import tempfile
+import uuid
+from datetime import date, timedelta
+
+# Configure before anything imports app.config
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='fitness-tests-'), 'test.db')}"
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("DASHBOARD_CACHE_BACKEND", "none")
+
+import pytest
+import requests
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+
+@pytest.fixture(scope="session")
+def api():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def token(api):
+    """Access token of a new user."""
+    return new_token(api)
+
+
+def new_token(api):
+    """Register a new user and return its access token."""
+    username = f"test_{uuid.uuid4().hex[:10]}"
+    password = "password123"
+    response = api.post(
+        "/auth/register",
+        json={"username": username, "email": f"{username}@example.com", "password": password}
+    )
+    assert response.status_code == 201
+    response = api.post("/auth/login", json={"username": username, "password": password})
+    return response.json()["access_token"]
+
+
+class InProcessSession:
+    """Stands in for the dashboard's pooled requests.Session, sending to the app in process.
+
+    Set `down` to make every request fail as if the API were unreachable.
+    """
+
+    def __init__(self, client: TestClient):
+        self.client = client
+        self.down = False
+
+    def request(self, method, url, timeout=None, **kwargs):
+        if self.down:
+            raise requests.ConnectionError("API unreachable")
+        return self.client.request(method, url, **kwargs)
+
+
+@pytest.fixture
+def api_session(api, monkeypatch):
+    """Route dashboard APIClient requests to the in-process API."""
+    from dashboard import api_client
+    
+    session = InProcessSession(api)
+    monkeypatch.setattr(api_client, "_session", session)
+    monkeypatch.setattr(api_client, "API_BASE_URL", "")
+    return session
+
+
+@pytest.fixture
+def client(api_session, token):
+    """Dashboard API client of a new user."""
+    from dashboard.api_client import APIClient
+    
+    return APIClient(token)
+
+
+def add_record(client, days_ago, calories=300):
+    """Create a running workout `days_ago` days back through the dashboard client."""
+    record = client.create_fitness_record({
+        "date": (date.today() - timedelta(days=days_ago)).isoformat(),
+        "workout_type": "running",
+        "duration_minutes": 30,
+        "calories_burned": calories,
+    })
+    assert "error" not in record
+    return record
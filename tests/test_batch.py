@@ -0,0 +1,77 @@
+"""Batch endpoints: health metric upserts and fitness record creation."""
+from tests.conftest import add_record
+
+
+def upsert(api, token, metrics, policy="overwrite"):
+    return api.put(
+        "/health-metrics/batch",
+        params={"policy": policy},
+        json={"metrics": metrics},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+
+def test_overwrite_keeps_the_metrics_an_entry_omits(api, token):
+    assert upsert(api, token, [{"date": "2024-01-01", "steps": 5000, "weight_kg": 80.0}]).status_code == 200
+    
+    response = upsert(api, token, [
+        {"date": "2024-01-01", "steps": 7000},
+        {"date": "2024-01-02", "weight_kg": 79.5},
+    ])
+    
+    assert response.status_code == 200
+    by_date = {metric["date"]: metric for metric in response.json()}
+    assert by_date["2024-01-01"]["steps"] == 7000
+    assert by_date["2024-01-01"]["weight_kg"] == 80.0
+    assert by_date["2024-01-02"]["steps"] is None
+
+
+def test_overwrite_clears_a_metric_submitted_as_null(api, token):
+    upsert(api, token, [{"date": "2024-01-01", "steps": 5000, "weight_kg": 80.0}])
+    
+    response = upsert(api, token, [{"date": "2024-01-01", "weight_kg": None}])
+    
+    assert response.json()[0]["steps"] == 5000
+    assert response.json()[0]["weight_kg"] is None
+
+
+def test_fill_nulls_only_fills_empty_metrics(api, token):
+    upsert(api, token, [{"date": "2024-01-01", "steps": 5000}])
+    
+    response = upsert(api, token, [{"date": "2024-01-01", "steps": 9000, "sleep_hours": 7.5}], policy="fill_nulls")
+    
+    assert response.json()[0]["steps"] == 5000
+    assert response.json()[0]["sleep_hours"] == 7.5
+
+
+def test_batch_reports_each_invalid_record_and_creates_the_rest(api, client, token):
+    valid = {"date": "2024-01-01", "workout_type": "running", "duration_minutes": 30, "calories_burned": 300}
+    response = api.post(
+        "/fitness-records/batch",
+        json={"records": [valid, {**valid, "duration_minutes": -5}, {"date": "2024-01-02"}, valid]},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["failed"]) == (2, 2)
+    assert [result["status"] for result in body["results"]] == ["created", "error", "error", "created"]
+    assert [result["index"] for result in body["results"]] == [0, 1, 2, 3]
+    assert body["results"][1]["error"]["code"] == "VALIDATION_ERROR"
+    assert body["results"][1]["error"]["message"].startswith("duration_minutes:")
+    created = {result["id"] for result in body["results"] if result["status"] == "created"}
+    assert {row["id"] for row in client.get_fitness_records()} == created
+
+
+def test_batch_of_only_invalid_records_writes_nothing(api, client, token):
+    add_record(client, 1)
+    version = api.get("/fitness-records", headers={"Authorization": f"Bearer {token}"}).headers["ETag"]
+    
+    response = api.post(
+        "/fitness-records/batch",
+        json={"records": [{"workout_type": "running"}]},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    
+    assert response.json()["created"] == 0
+    assert api.get("/fitness-records", headers={"Authorization": f"Bearer {token}"}).headers["ETag"] == version
@@ -0,0 +1,85 @@
+"""Per-user response cache of the dashboard."""
+import time
+
+import pytest
+from jose import jwt
+
+from dashboard import api_client
+from dashboard.cache import MemoryBackend, ResponseCache, SQLiteBackend
+from tests.conftest import add_record
+
+
+def make_token(user_id):
+    return jwt.encode({"sub": user_id, "exp": time.time() + 600}, "secret", algorithm="HS256")
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def cache(request, tmp_path):
+    if request.param == "memory":
+        return ResponseCache(MemoryBackend(100, 60))
+    return ResponseCache(SQLiteBackend(str(tmp_path / "cache.db"), 100, 60))
+
+
+def test_entries_are_keyed_by_filters(cache):
+    token = make_token("u1")
+    cache.remember(token)
+    march = cache.key(token, "/fitness-records/summary", {"start_date": "2026-03-01"})
+    april = cache.key(token, "/fitness-records/summary", {"start_date": "2026-04-01"})
+    cache.set(token, march, {"periods": [1]})
+    
+    assert cache.get(token, march) == {"periods": [1]}
+    assert cache.get(token, april) is None
+
+
+def test_tokens_of_one_user_share_entries(cache):
+    first, second = make_token("u1"), make_token("u1")
+    cache.remember(first)
+    cache.remember(second)
+    cache.set(first, cache.key(first, "/health-metrics", {}), [1])
+    
+    assert cache.get(second, cache.key(second, "/health-metrics", {})) == [1]
+
+
+def test_unaccepted_token_reads_nothing(cache):
+    owner, forged = make_token("u1"), make_token("u1")
+    cache.remember(owner)
+    cache.set(owner, cache.key(owner, "/health-metrics", {}), [1])
+    
+    assert cache.get(forged, cache.key(forged, "/health-metrics", {})) is None
+
+
+def test_write_during_request_orphans_its_response(cache):
+    token = make_token("u1")
+    cache.remember(token)
+    key = cache.key(token, "/fitness-records", {})
+    cache.invalidate(token, "fitness")
+    cache.set(token, key, ["stale"])
+    
+    assert cache.get(token, cache.key(token, "/fitness-records", {})) is None
+
+
+def test_sqlite_backend_is_shared_between_processes(tmp_path):
+    path = str(tmp_path / "cache.db")
+    worker, other_worker = ResponseCache(SQLiteBackend(path, 100, 60)), ResponseCache(SQLiteBackend(path, 100, 60))
+    token = make_token("u1")
+    worker.remember(token)
+    other_worker.remember(token)
+    worker.set(token, worker.key(token, "/health-metrics", {}), [1])
+    
+    assert other_worker.get(token, other_worker.key(token, "/health-metrics", {})) == [1]
+    other_worker.invalidate(token, "health")
+    assert worker.get(token, worker.key(token, "/health-metrics", {})) is None
+
+
+def test_client_writes_invalidate_cached_reads(client, monkeypatch):
+    monkeypatch.setattr(api_client, "response_cache", ResponseCache(MemoryBackend(100, 60)))
+    add_record(client, 2)
+    client.get_fitness_summary()
+    
+    client.get_fitness_summary()
+    assert client.cache_hits == 1
+    
+    add_record(client, 1)
+    summary = client.get_fitness_summary()
+    assert client.cache_hits == 1
+    assert sum(period["workout_count"] for period in summary["periods"]) == 2
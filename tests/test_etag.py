@@ -0,0 +1,64 @@
+"""ETags and conditional GETs driven by per-user data versions."""
+from tests.conftest import add_record
+
+
+def get(api, token, path, etag=None, **params):
+    headers = {"Authorization": f"Bearer {token}"}
+    if etag:
+        headers["If-None-Match"] = etag
+    return api.get(path, params=params, headers=headers)
+
+
+def test_unchanged_list_is_not_modified(api, client, token):
+    add_record(client, 1)
+    first = get(api, token, "/fitness-records")
+    
+    response = get(api, token, "/fitness-records", first.headers["ETag"])
+    
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == first.headers["ETag"]
+
+
+def test_write_changes_the_etag(api, client, token):
+    add_record(client, 2)
+    etag = get(api, token, "/fitness-records").headers["ETag"]
+    
+    add_record(client, 1)
+    response = get(api, token, "/fitness-records", etag)
+    
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["ETag"] != etag
+
+
+def test_etag_depends_on_the_query_and_resource(api, client, token):
+    add_record(client, 1)
+    etag = get(api, token, "/fitness-records/summary").headers["ETag"]
+    
+    assert get(api, token, "/fitness-records/summary", etag, bucket="week").status_code == 200
+    assert get(api, token, "/health-metrics/summary", etag).status_code == 200
+
+
+def test_other_resource_writes_keep_the_etag(api, client, token):
+    add_record(client, 1)
+    etag = get(api, token, "/fitness-records/summary").headers["ETag"]
+    
+    client.create_health_metric({"date": "2024-01-01", "steps": 5000})
+    
+    assert get(api, token, "/fitness-records/summary", etag).status_code == 304
+
+
+def test_weak_and_listed_etags_match(api, client, token):
+    add_record(client, 1)
+    etag = get(api, token, "/fitness-records").headers["ETag"]
+    
+    assert get(api, token, "/fitness-records", f'"stale", W/{etag}').status_code == 304
+
+
+def test_client_revalidates_with_its_etag(client):
+    add_record(client, 1)
+    first = client.get_fitness_summary()
+    
+    assert client.get_fitness_summary() == first
+    assert client.not_modified == 1
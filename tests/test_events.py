@@ -0,0 +1,49 @@
+"""Stream tickets for the Server-Sent Events route."""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app import security
+from app.cache import TTLCache
+from app.security import get_stream_user
+
+
+def new_ticket(api, token):
+    response = api.post("/events/ticket", headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    return response.json()["ticket"]
+
+
+def redeem(ticket):
+    return asyncio.run(get_stream_user(ticket=ticket, credentials=None))
+
+
+def test_ticket_opens_one_stream(api, token):
+    ticket = new_ticket(api, token)
+    
+    assert redeem(ticket).username
+    with pytest.raises(HTTPException) as error:
+        redeem(ticket)
+    assert error.value.detail["code"] == "TICKET_USED"
+
+
+def test_rejected_ticket_is_not_spent(api, token, monkeypatch):
+    ticket = new_ticket(api, token)
+    monkeypatch.setattr(security, "_load_user", lambda db, user_id: None)
+    monkeypatch.setattr(security.user_cache, "get", lambda key, default=None: default)
+    
+    with pytest.raises(HTTPException):
+        redeem(ticket)
+    
+    monkeypatch.undo()
+    assert redeem(ticket).username
+
+
+def test_full_ticket_cache_refuses_instead_of_evicting(api, token, monkeypatch):
+    monkeypatch.setattr(security, "_spent_tickets", TTLCache(1, 30))
+    redeem(new_ticket(api, token))
+    
+    with pytest.raises(HTTPException) as error:
+        redeem(new_ticket(api, token))
+    assert error.value.status_code == 503
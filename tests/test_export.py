@@ -0,0 +1,21 @@
+"""Streamed history exports."""
+import orjson
+
+from tests.conftest import add_record
+
+
+def test_export_streams_the_history_oldest_first(api, client, token):
+    newer = add_record(client, 1)
+    older = add_record(client, 2)
+    
+    response = api.get("/export/fitness-records", headers={"Authorization": f"Bearer {token}"})
+    
+    assert response.status_code == 200
+    rows = [orjson.loads(line) for line in response.content.splitlines()]
+    assert [row["id"] for row in rows] == [older["id"], newer["id"]]
+
+
+def test_export_rejects_an_invalid_token(api):
+    response = api.get("/export/fitness-records", headers={"Authorization": "Bearer not-a-token"})
+    
+    assert response.status_code == 401
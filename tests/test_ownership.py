@@ -0,0 +1,61 @@
+"""Owner-scoped single-statement updates and deletes."""
+import pytest
+
+from tests.conftest import new_token
+
+RESOURCES = {
+    "fitness-records": {"date": "2024-01-01", "workout_type": "running", "duration_minutes": 30, "calories_burned": 300},
+    "health-metrics": {"date": "2024-01-01", "steps": 5000},
+}
+
+CHANGES = {"fitness-records": {"calories_burned": 450}, "health-metrics": {"steps": 7000}}
+
+
+@pytest.fixture(params=sorted(RESOURCES))
+def resource(request):
+    return request.param
+
+
+def create(api, token, resource):
+    response = api.post(f"/{resource}", json=RESOURCES[resource], headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_update_returns_the_changed_row(api, token, resource):
+    row = create(api, token, resource)
+    
+    response = api.put(f"/{resource}/{row['id']}", json=CHANGES[resource], headers={"Authorization": f"Bearer {token}"})
+    
+    assert response.status_code == 200
+    assert response.json() == {**row, **CHANGES[resource], "updated_at": response.json()["updated_at"]}
+
+
+def test_delete_removes_the_row(api, token, resource):
+    headers = {"Authorization": f"Bearer {token}"}
+    row = create(api, token, resource)
+    
+    assert api.delete(f"/{resource}/{row['id']}", headers=headers).status_code == 204
+    assert api.delete(f"/{resource}/{row['id']}", headers=headers).status_code == 404
+
+
+def test_missing_row_is_not_found(api, token, resource):
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    response = api.put(f"/{resource}/no-such-id", json=CHANGES[resource], headers=headers)
+    
+    assert response.status_code == 404
+    assert response.json()["detail"]["code"] == "RESOURCE_NOT_FOUND"
+
+
+def test_other_users_row_is_forbidden_and_untouched(api, token, resource):
+    row = create(api, token, resource)
+    other = {"Authorization": f"Bearer {new_token(api)}"}
+    
+    assert api.put(f"/{resource}/{row['id']}", json=CHANGES[resource], headers=other).status_code == 403
+    response = api.delete(f"/{resource}/{row['id']}", headers=other)
+    
+    assert response.status_code == 403
+    assert response.json()["detail"]["code"] == "ACCESS_DENIED"
+    owned = api.get(f"/{resource}", headers={"Authorization": f"Bearer {token}"}).json()
+    assert owned == [row]
@@ -0,0 +1,99 @@
+"""Cursor pagination of the list endpoints and the dashboard client's getters and iterators."""
+from app.pagination import NEXT_CURSOR_HEADER
+from tests.conftest import add_record
+
+
+def list_page(api, token, **params):
+    response = api.get("/fitness-records", params=params, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    return response.json(), response.headers.get(NEXT_CURSOR_HEADER)
+
+
+def test_cursor_pages_split_a_day_without_gaps_or_repeats(api, client, token):
+    records = [add_record(client, 1) for _ in range(5)]
+    
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        rows, cursor = list_page(api, token, **params)
+        seen.extend(row["id"] for row in rows)
+        if not cursor:
+            break
+    
+    assert sorted(seen) == sorted(record["id"] for record in records)
+    assert len(seen) == len(set(seen))
+
+
+def test_last_full_page_has_no_cursor(api, client, token):
+    for days_ago in (2, 1):
+        add_record(client, days_ago)
+    
+    rows, cursor = list_page(api, token, limit=2)
+    
+    assert len(rows) == 2
+    assert cursor is None
+
+
+def test_cursor_keeps_the_date_filter(api, client, token):
+    for days_ago in (4, 3, 2, 1):
+        add_record(client, days_ago)
+    start = add_record(client, 3)["date"]
+    
+    first, cursor = list_page(api, token, limit=2, start_date=start)
+    rest, _ = list_page(api, token, limit=2, start_date=start, cursor=cursor)
+    
+    assert all(row["date"] >= start for row in first + rest)
+    assert len(first + rest) == 4
+
+
+def test_malformed_cursor_is_rejected(api, token):
+    response = api.get("/fitness-records", params={"cursor": "not a cursor"}, headers={"Authorization": f"Bearer {token}"})
+    
+    assert response.status_code == 400
+    assert response.json()["detail"]["code"] == "INVALID_CURSOR"
+
+
+def test_iterator_follows_every_page(client):
+    records = [add_record(client, days_ago) for days_ago in range(5, 0, -1)]
+    
+    rows = list(client.iter_fitness_records(page_size=2))
+    
+    assert [row["id"] for row in rows] == [record["id"] for record in reversed(records)]
+
+
+def test_iterator_stops_at_limit_without_fetching_more(client):
+    for days_ago in range(5, 0, -1):
+        add_record(client, days_ago)
+    
+    calls = client.api_calls
+    rows = list(client.iter_fitness_records(page_size=2, limit=3))
+    
+    assert len(rows) == 3
+    assert client.api_calls - calls == 2
+
+
+def test_zero_limit_yields_nothing_and_fetches_nothing(client):
+    add_record(client, 1)
+    
+    calls = client.api_calls
+    
+    assert list(client.iter_fitness_records(limit=0)) == []
+    assert client.get_fitness_records(limit=0) == []
+    assert client.api_calls == calls
+
+
+def test_getter_returns_every_record(client):
+    records = [add_record(client, days_ago) for days_ago in range(5, 0, -1)]
+    
+    assert len(client.get_fitness_records()) == len(records)
+    assert [row["id"] for row in client.get_fitness_records(limit=2)] == [records[-1]["id"], records[-2]["id"]]
+
+
+def test_frames_are_typed_per_page(client):
+    for days_ago in range(3, 0, -1):
+        add_record(client, days_ago)
+    
+    frames = list(client.iter_fitness_frames(page_size=2))
+    
+    assert [len(frame) for frame in frames] == [2, 1]
+    assert str(frames[0]["workout_type"].dtype) == "category"
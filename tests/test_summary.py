@@ -0,0 +1,79 @@
+"""Fitness summaries read from the incrementally maintained daily rollups."""
+from app.database import SessionLocal
+from app.models import DailyRollup
+from app.rollups import rebuild_rollups
+
+
+def create(api, token, day, workout_type="running", duration=30, calories=300):
+    response = api.post(
+        "/fitness-records",
+        json={"date": day, "workout_type": workout_type, "duration_minutes": duration, "calories_burned": calories},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def summary(api, token, **params):
+    response = api.get("/fitness-records/summary", params=params, headers={"Authorization": f"Bearer {token}"})
+    assert response.status_code == 200
+    return response.json()
+
+
+def counts(periods):
+    return {period["period"]: period["workout_count"] for period in periods}
+
+
+def test_weeks_start_on_monday_and_months_on_the_first(api, token):
+    for day in ("2024-01-01", "2024-01-07", "2024-01-08", "2024-02-03"):
+        create(api, token, day)
+    
+    assert counts(summary(api, token, bucket="week")["periods"]) == {
+        "2024-01-01": 2, "2024-01-08": 1, "2024-01-29": 1
+    }
+    assert counts(summary(api, token, bucket="month")["periods"]) == {"2024-01-01": 3, "2024-02-01": 1}
+
+
+def test_day_totals_and_averages(api, token):
+    create(api, token, "2024-01-01", duration=20, calories=200)
+    create(api, token, "2024-01-01", workout_type="yoga", duration=40, calories=100)
+    
+    (period,) = summary(api, token)["periods"]
+    
+    assert period["total_duration_minutes"] == 60
+    assert period["avg_calories"] == 150
+    assert {row["workout_type"] for row in summary(api, token)["workout_types"]} == {"running", "yoga"}
+
+
+def test_rollups_follow_updates_and_deletes(api, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    moved = create(api, token, "2024-01-01")
+    removed = create(api, token, "2024-01-02")
+    
+    assert api.put(f"/fitness-records/{moved['id']}", json={"workout_type": "yoga"}, headers=headers).status_code == 200
+    assert api.delete(f"/fitness-records/{removed['id']}", headers=headers).status_code == 204
+    
+    body = summary(api, token)
+    assert counts(body["periods"]) == {"2024-01-01": 1}
+    assert [row["workout_type"] for row in body["workout_types"]] == ["yoga"]
+
+
+def test_rebuild_matches_the_incremental_rollups(api, token):
+    headers = {"Authorization": f"Bearer {token}"}
+    create(api, token, "2024-01-01", calories=250)
+    record = create(api, token, "2024-01-01", workout_type="cycling")
+    api.put(f"/fitness-records/{record['id']}", json={"calories_burned": 500}, headers=headers)
+    user_id = record["user_id"]
+    
+    def rollups(db):
+        rows = db.query(DailyRollup).filter(DailyRollup.user_id == user_id).all()
+        return sorted((row.date, row.workout_type, row.workout_count, row.total_calories) for row in rows)
+    
+    db = SessionLocal()
+    try:
+        incremental = rollups(db)
+        rebuild_rollups(db, user_id)
+        db.commit()
+        assert rollups(db) == incremental
+    finally:
+        db.close()
@@ -0,0 +1,121 @@
+"""Delta sync of the dashboard client's local copies against the API."""
+import pytest
+
+from dashboard import api_client
+from dashboard.api_client import APIClient
+from tests.conftest import add_record
+
+
+@pytest.fixture(autouse=True)
+def no_overlap(monkeypatch):
+    # Without the overlap an unchanged resource keeps its watermark, so its next sync is a 304
+    monkeypatch.setattr("app.sync.SYNC_OVERLAP_SECONDS", 0)
+
+
+def test_first_sync_returns_everything_most_recent_first(client):
+    older = add_record(client, 2)
+    newer = add_record(client, 1)
+    
+    rows = client.sync_fitness_records().rows
+    
+    assert [row["id"] for row in rows] == [newer["id"], older["id"]]
+
+
+def test_sync_picks_up_inserts(client):
+    first = add_record(client, 2)
+    client.sync_fitness_records()
+    second = add_record(client, 1)
+    
+    rows = client.sync_fitness_records().rows
+    
+    assert {row["id"] for row in rows} == {first["id"], second["id"]}
+
+
+def test_sync_version_moves_only_with_the_rows(client):
+    add_record(client, 2)
+    first = client.sync_fitness_records()
+    
+    assert client.sync_fitness_records().version == first.version
+    
+    add_record(client, 1)
+    
+    assert client.sync_fitness_records().version != first.version
+
+
+def test_sync_picks_up_updates(api, client, token):
+    record = add_record(client, 1, calories=300)
+    client.sync_fitness_records()
+    response = api.put(
+        f"/fitness-records/{record['id']}",
+        json={"calories_burned": 450},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 200
+    
+    rows = client.sync_fitness_records().rows
+    
+    assert [row["calories_burned"] for row in rows] == [450]
+
+
+def test_sync_drops_deleted_rows(client):
+    kept = add_record(client, 2)
+    deleted = add_record(client, 1)
+    client.sync_fitness_records()
+    assert client.delete_fitness_record(deleted["id"])
+    
+    rows = client.sync_fitness_records().rows
+    
+    assert [row["id"] for row in rows] == [kept["id"]]
+
+
+def test_unchanged_resource_costs_one_304(client):
+    record = add_record(client, 1)
+    client.sync_fitness_records()
+    client.sync_fitness_records()
+    
+    calls, not_modified = client.api_calls, client.not_modified
+    rows = client.sync_fitness_records().rows
+    
+    assert [row["id"] for row in rows] == [record["id"]]
+    assert client.api_calls - calls == 1
+    assert client.not_modified - not_modified == 1
+
+
+def test_first_sync_follows_every_page(client, monkeypatch):
+    monkeypatch.setattr(api_client, "SYNC_PAGE_SIZE", 2)
+    records = [add_record(client, days_ago) for days_ago in range(5, 0, -1)]
+    
+    rows = client.sync_fitness_records().rows
+    
+    assert [row["id"] for row in rows] == [record["id"] for record in reversed(records)]
+
+
+def test_expired_watermark_resyncs_fully(client, token):
+    kept = add_record(client, 2)
+    deleted = add_record(client, 1)
+    client.sync_fitness_records()
+    assert client.delete_fitness_record(deleted["id"])
+    # A watermark older than the tombstone retention gets a 410 from /deleted
+    api_client._synced[(token, "/fitness-records")]["watermark"] = "2000-01-01T00:00:00"
+    
+    rows = client.sync_fitness_records().rows
+    
+    assert [row["id"] for row in rows] == [kept["id"]]
+    assert api_client._synced[(token, "/fitness-records")]["watermark"] != "2000-01-01T00:00:00"
+
+
+def test_failed_sync_keeps_the_last_copy(api_session, client):
+    record = add_record(client, 1)
+    client.sync_fitness_records()
+    
+    api_session.down = True
+    rows = client.sync_fitness_records().rows
+    
+    assert [row["id"] for row in rows] == [record["id"]]
+
+
+def test_failed_first_sync_returns_none_and_caches_nothing(api_session):
+    client = APIClient("not-a-token")
+    
+    assert client.sync_fitness_records() is None
+    assert ("not-a-token", "/fitness-records") not in api_client._synced